@@ -0,0 +1 @@
+"Microbenchmarks for SudoLink hot paths (`python -m benchmarks --help`)."
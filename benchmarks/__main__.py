@@ -0,0 +1,62 @@
+"""Run or compare microbenchmarks.
+
+    python -m benchmarks run -o before.json
+    python -m benchmarks run -o after.json
+    python -m benchmarks compare before.json after.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Sequence
+
+from benchmarks import runner, suites  # noqa: F401 - importing suites registers benchmarks
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="Run benchmarks and write a JSON report.")
+    run_cmd.add_argument("-o", "--output", help="Write the JSON report here.")
+    run_cmd.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this.")
+    run_cmd.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat (default 0.2).")
+    run_cmd.add_argument("--repeats", type=int, default=5, help="Repeats per benchmark (default 5).")
+    run_cmd.add_argument("--list", action="store_true", help="List benchmarks and exit.")
+
+    cmp_cmd = commands.add_parser("compare", help="Compare two reports and flag regressions.")
+    cmp_cmd.add_argument("baseline")
+    cmp_cmd.add_argument("current")
+    cmp_cmd.add_argument(
+        "--threshold", type=float, default=0.10, help="Median slowdown counted as a regression (default 0.10)."
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        selected = runner.registered(args.filter)
+        if args.list:
+            for bench in selected:
+                print(f"{bench.group:<8} {bench.name}")
+            return 0
+        report = runner.run(
+            selected, min_time=args.min_time, repeats=args.repeats, progress=print
+        )
+        if args.output:
+            runner.save(report, args.output)
+            print(f"Wrote {len(selected)} results to {args.output}")
+        return 0
+
+    rows = runner.compare(
+        runner.load(args.baseline), runner.load(args.current), threshold=args.threshold
+    )
+    print(runner.format_comparison(rows))
+    regressions = [row.name for row in rows if row.status == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"Deterministic synthetic inputs for the benchmarks."
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+
+from telegram import Chat, Message, MessageEntity
+
+from sudolink.types import LinkBundle, MetaInfo, SearchResult
+
+_WORDS = (
+    "minister election budget court ruling climate summit market rally strike "
+    "vaccine trial report inquiry border talks ceasefire merger outage storm "
+    "record protest council verdict tariff launch satellite league transfer"
+).split()
+_DOMAINS = [f"news{i}.example.com" for i in range(40)] + [
+    "www.reuters.com",
+    "apnews.com",
+    "www.bbc.co.uk",
+    "www.theguardian.com",
+    "www.nytimes.com",
+]
+_CHAT = Chat(id=1, type=Chat.PRIVATE)
+_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def article_url(rng: random.Random, *, domain: str | None = None) -> str:
+    host = domain or rng.choice(_DOMAINS)
+    slug = "-".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 8)))
+    return f"https://{host}/{rng.randint(2015, 2025)}/{rng.randint(1, 12):02d}/{slug}?utm_source=tg#top"
+
+
+def messages(count: int, *, seed: int = 1) -> list[Message]:
+    """A mix of entity-tagged, plain-text, caption-only and link-free messages."""
+
+    rng = _rng(seed)
+    result: list[Message] = []
+    for idx in range(count):
+        url = article_url(rng)
+        lead = sentence(rng, rng.randint(3, 40))
+        kind = idx % 4
+        if kind == 0:
+            text = f"{lead} {url} {sentence(rng, 5)}"
+            offset = len(lead) + 1
+            entities = (MessageEntity(MessageEntity.URL, offset=offset, length=len(url)),)
+            result.append(Message(idx, _DATE, _CHAT, text=text, entities=entities))
+        elif kind == 1:
+            text = f"{lead} www.{url.split('://', 1)[1]}"
+            result.append(Message(idx, _DATE, _CHAT, text=text))
+        elif kind == 2:
+            result.append(Message(idx, _DATE, _CHAT, caption=f"{lead} {url}"))
+        else:
+            result.append(Message(idx, _DATE, _CHAT, text=sentence(rng, rng.randint(10, 60))))
+    return result
+
+
+def raw_urls(count: int, *, seed: int = 2) -> list[str]:
+    rng = _rng(seed)
+    variants = []
+    for idx in range(count):
+        url = article_url(rng)
+        if idx % 3 == 1:
+            url = url.split("://", 1)[1]
+        elif idx % 3 == 2:
+            url = f"  {url}  "
+        variants.append(url)
+    return variants
+
+
+def article_html(target_bytes: int, *, seed: int = 3, description_words: int = 30) -> str:
+    """A news-like page padded with paragraphs until it reaches `target_bytes`."""
+
+    rng = _rng(seed)
+    description = ". ".join(
+        sentence(rng, min(30, description_words - start))
+        for start in range(0, max(1, description_words), 30)
+    )
+    head = (
+        "<!doctype html><html><head><meta charset='utf-8'>"
+        f"<title>{sentence(rng, 8).title()}</title>"
+        f"<meta name='description' content='{description}'>"
+        f"<meta property='og:title' content='{sentence(rng, 8)}'>"
+        f"<meta property='og:description' content='{sentence(rng, 25)}'>"
+        f"<meta name='keywords' content='{', '.join(rng.sample(_WORDS, 12))}'>"
+        + "".join(
+            f"<link rel='preload' href='/static/{i}.js'><script src='/static/{i}.js'></script>"
+            for i in range(20)
+        )
+        + "</head><body><header><nav>"
+        + "".join(f"<a href='/section/{w}'>{w}</a>" for w in _WORDS)
+        + "</nav></header><article>"
+    )
+    parts = [head]
+    size = len(head)
+    while size < target_bytes:
+        para = f"<p class='para'>{sentence(rng, 60)} <a href='{article_url(rng)}'>more</a></p>"
+        parts.append(para)
+        size += len(para)
+    parts.append("</article><footer>(c) Example News</footer></body></html>")
+    return "".join(parts)
+
+
+def search_results(count: int, *, seed: int = 4, duplicate_ratio: float = 0.2) -> list[SearchResult]:
+    rng = _rng(seed)
+    results: list[SearchResult] = []
+    for _ in range(count):
+        if results and rng.random() < duplicate_ratio:
+            original = rng.choice(results)
+            results.append(
+                SearchResult(title=original.title.upper(), url=original.url.rstrip("/") + "/")
+            )
+            continue
+        results.append(
+            SearchResult(
+                title=sentence(rng, rng.randint(4, 12)).title(),
+                url=article_url(rng),
+                description=sentence(rng, 25),
+                source=rng.choice(["Reuters", "AP", "BBC", None]),
+            )
+        )
+    return results
+
+
+def openai_payload(count: int, *, seed: int = 5) -> dict[str, object]:
+    rng = _rng(seed)
+    links: list[object] = []
+    for idx in range(count):
+        if idx % 17 == 0:
+            links.append("not-an-object")
+            continue
+        links.append(
+            {
+                "title": sentence(rng, rng.randint(4, 12)).title(),
+                "url": article_url(rng) if idx % 13 else "",
+                "source": rng.choice(["Reuters", "AP", "BBC", ""]),
+                "summary": sentence(rng, rng.randint(15, 60)),
+            }
+        )
+    return {"related_links": links, "insights": [sentence(rng, 20) for _ in range(count // 4)]}
+
+
+def article_meta(description_words: int, *, seed: int = 8) -> MetaInfo:
+    """Metadata as scraped from a verbose page: repeated sentences and keyword spam."""
+
+    rng = _rng(seed)
+    sentences = [
+        sentence(rng, 18).capitalize() + "." for _ in range(max(1, description_words // 18))
+    ]
+    keywords = [sentence(rng, rng.randint(1, 2)) for _ in range(40)]
+    return MetaInfo(
+        url=article_url(rng),
+        title=sentence(rng, 12).title(),
+        description="  ".join(sentences + sentences[:3]),
+        keywords=tuple(keywords + [keyword.upper() for keyword in keywords[:10]]),
+    )
+
+
+def bundle(related: int, insights: int, *, seed: int = 6) -> LinkBundle:
+    rng = _rng(seed)
+    original = MetaInfo(
+        url=article_url(rng),
+        title=sentence(rng, 10) + " <&> \"quoted\"",
+        description=sentence(rng, 40),
+        keywords=tuple(rng.sample(_WORDS, 8)),
+    )
+    items = search_results(related, seed=seed, duplicate_ratio=0.0)
+    for item in items[::2]:
+        item.published_at = _DATE
+    return LinkBundle(
+        original=original,
+        related=tuple(items),
+        insights=tuple(sentence(rng, 25) + " & <b>" for _ in range(insights)),
+    )
@@ -0,0 +1 @@
+"Hermetic end-to-end load harness (`python -m benchmarks.load --help`)."
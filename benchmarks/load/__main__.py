@@ -0,0 +1,81 @@
+"""Hermetic load test: fake OpenAI, Telegram and publishers on localhost.
+
+    python -m benchmarks.load --rate 20 --duration 60 --openai-latency-ms 1200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Sequence
+
+from benchmarks.load.fakes import FakeConfig
+from benchmarks.load.harness import LoadSpec, run_load
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--rate", type=float, default=5.0, help="Offered /links requests per second.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load.")
+    parser.add_argument(
+        "--concurrent-updates", type=int, default=64, help="SUDOLINK_CONCURRENT_UPDATES for the bot."
+    )
+    parser.add_argument(
+        "--unique-articles", type=int, default=0, help="Article pool size (0: every request unique)."
+    )
+    parser.add_argument("--cache", action="store_true", help="Enable the bundle cache.")
+    parser.add_argument(
+        "--prompt-token-budget", type=int, default=600, help="SUDOLINK_PROMPT_TOKEN_BUDGET (0: no compaction)."
+    )
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=1500.0, help="Median completion latency.")
+    parser.add_argument("--openai-sigma", type=float, default=0.4, help="Log-normal spread of that latency.")
+    parser.add_argument(
+        "--openai-ms-per-1k-tokens", type=float, default=0.0, help="Extra latency per 1k prompt+completion tokens."
+    )
+    parser.add_argument("--openai-error-rate", type=float, default=0.0, help="Fraction of 500 responses.")
+    parser.add_argument("--openai-429-rate", type=float, default=0.0, help="Fraction of 429 responses.")
+    parser.add_argument("--publisher-latency-ms", type=float, default=120.0)
+    parser.add_argument(
+        "--description-words", type=int, default=30, help="Length of each article's meta description."
+    )
+    parser.add_argument("--publisher-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="Also write the JSON report here.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    spec = LoadSpec(
+        rate=args.rate,
+        duration=args.duration,
+        concurrent_updates=args.concurrent_updates,
+        unique_articles=args.unique_articles,
+        cache=args.cache,
+        prompt_token_budget=args.prompt_token_budget,
+        drain_timeout=args.drain_timeout,
+        seed=args.seed,
+        fake=FakeConfig(
+            openai_latency_ms=args.openai_latency_ms,
+            openai_latency_sigma=args.openai_sigma,
+            openai_error_rate=args.openai_error_rate,
+            openai_429_rate=args.openai_429_rate,
+            openai_ms_per_1k_tokens=args.openai_ms_per_1k_tokens,
+            publisher_latency_ms=args.publisher_latency_ms,
+            publisher_error_rate=args.publisher_error_rate,
+            article_description_words=args.description_words,
+            seed=args.seed,
+        ),
+    )
+    report = asyncio.run(run_load(spec))
+    rendered = json.dumps(report, indent=2)
+    print(rendered)
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    return 0 if report["requests"]["unanswered"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,308 @@
+"""Local stand-ins for OpenAI, the Telegram Bot API and news publishers.
+
+All three run in one child process (see `serve`) so their CPU use does not
+skew the bot's numbers. The fake Telegram server also drives the load: the
+harness asks it to emit `/links` updates at a target rate and it timestamps
+each one, so latency is measured from "update available" to "sendMessage
+received", exactly what a user would see.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import Connection
+from typing import Any
+from urllib.parse import parse_qsl
+
+from benchmarks import corpora
+from benchmarks.load.http import HttpServer, Request, Response
+
+
+@dataclass(slots=True)
+class FakeConfig:
+    openai_latency_ms: float = 1500.0
+    openai_latency_sigma: float = 0.4
+    openai_error_rate: float = 0.0
+    openai_429_rate: float = 0.0
+    openai_ms_per_1k_tokens: float = 0.0
+    publisher_latency_ms: float = 120.0
+    publisher_latency_sigma: float = 0.6
+    publisher_error_rate: float = 0.0
+    article_kb: tuple[int, ...] = (20, 80, 300)
+    article_description_words: int = 30
+    links: int = 6
+    insights: int = 3
+    seed: int = 7
+
+
+def _lognormal(rng: random.Random, median_ms: float, sigma: float) -> float:
+    if median_ms <= 0:
+        return 0.0
+    return rng.lognormvariate(math.log(median_ms / 1000), sigma)
+
+
+class FakeOpenAI:
+    """`POST /v1/chat/completions` with configurable latency, 5xx and 429 rates.
+
+    Latency can also grow with prompt and completion size
+    (`openai_ms_per_1k_tokens`), which is how the real API behaves.
+    """
+
+    def __init__(self, config: FakeConfig) -> None:
+        self._config = config
+        self._rng = random.Random(config.seed)
+        self.stats = {"requests": 0, "ok": 0, "errors_500": 0, "errors_429": 0}
+
+    async def handle(self, request: Request) -> Response:
+        if request.method != "POST" or not request.path.endswith("/chat/completions"):
+            return Response.json({"error": {"message": "not found"}}, status=404)
+        self.stats["requests"] += 1
+        body = json.loads(request.body or b"{}")
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", ()))
+        await asyncio.sleep(
+            _lognormal(self._rng, self._config.openai_latency_ms, self._config.openai_latency_sigma)
+            + self._config.openai_ms_per_1k_tokens * prompt_chars / 4 / 1_000_000
+        )
+        roll = self._rng.random()
+        if roll < self._config.openai_429_rate:
+            self.stats["errors_429"] += 1
+            return Response.json(
+                {"error": {"message": "Rate limit reached", "type": "requests"}},
+                status=429,
+                **{"retry-after": "1"},
+            )
+        if roll < self._config.openai_429_rate + self._config.openai_error_rate:
+            self.stats["errors_500"] += 1
+            return Response.json({"error": {"message": "upstream error"}}, status=500)
+
+        payload = corpora.openai_payload(self._config.links, seed=self._rng.randint(0, 1 << 30))
+        payload["related_links"] = [
+            entry for entry in payload["related_links"] if isinstance(entry, dict)
+        ]
+        payload["insights"] = payload["insights"][: self._config.insights] or [
+            corpora.sentence(self._rng, 15) for _ in range(self._config.insights)
+        ]
+        content = json.dumps(payload)
+        prompt_tokens = prompt_chars // 4
+        completion_tokens = len(content) // 4
+        if self._config.openai_ms_per_1k_tokens:
+            await asyncio.sleep(self._config.openai_ms_per_1k_tokens * completion_tokens / 1_000_000)
+        self.stats["ok"] += 1
+        return Response.json(
+            {
+                "id": f"chatcmpl-{self.stats['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+
+
+class FakePublisher:
+    """Serves `/article/<n>` pages of realistic size and structure."""
+
+    def __init__(self, config: FakeConfig) -> None:
+        self._config = config
+        self._rng = random.Random(config.seed + 1)
+        self._pages = {
+            size: corpora.article_html(
+                size * 1000, seed=size, description_words=config.article_description_words
+            ).encode("utf-8")
+            for size in config.article_kb
+        }
+        self.stats = {"requests": 0, "errors": 0}
+
+    async def handle(self, request: Request) -> Response:
+        if not request.path.startswith("/article/"):
+            return Response(status=404, body=b"not found", content_type="text/plain")
+        self.stats["requests"] += 1
+        await asyncio.sleep(
+            _lognormal(
+                self._rng, self._config.publisher_latency_ms, self._config.publisher_latency_sigma
+            )
+        )
+        if self._rng.random() < self._config.publisher_error_rate:
+            self.stats["errors"] += 1
+            return Response(status=500, body=b"oops", content_type="text/plain")
+        sizes = self._config.article_kb
+        page = self._pages[sizes[zlib.crc32(request.path.encode()) % len(sizes)]]
+        return Response(body=page, content_type="text/html; charset=utf-8")
+
+
+class FakeTelegram:
+    """Bot API subset used by python-telegram-bot polling, plus harness controls."""
+
+    def __init__(self) -> None:
+        self._updates: list[dict[str, Any]] = []
+        self._next_update_id = 1
+        self._arrived = asyncio.Event()
+        self._issued: dict[int, float] = {}
+        self._latencies: list[float] = []
+        self._outcomes: dict[str, int] = {}
+        self._sent = 0
+        self._started_at = 0.0
+        self._last_reply_at = 0.0
+        self._generator: asyncio.Task[None] | None = None
+        self._bot_user = {"id": 1, "is_bot": True, "first_name": "SudoLink", "username": "sudolink_load_bot"}
+
+    async def handle(self, request: Request) -> Response:
+        if request.path.startswith("/_harness/"):
+            return await self._control(request)
+        method = request.path.rsplit("/", 1)[-1]
+        params = _bot_params(request)
+        if method == "getMe":
+            return _ok(self._bot_user)
+        if method == "getUpdates":
+            return _ok(await self._get_updates(params))
+        if method == "sendMessage":
+            return _ok(self._on_send_message(params))
+        return _ok(True)
+
+    async def _get_updates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates:
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), float(params.get("timeout") or 0))
+            except asyncio.TimeoutError:
+                pass
+        limit = int(params.get("limit") or 100)
+        return self._updates[:limit]
+
+    def _on_send_message(self, params: dict[str, Any]) -> dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        text = str(params.get("text", ""))
+        issued = self._issued.pop(chat_id, None)
+        now = time.perf_counter()
+        if issued is not None:
+            self._latencies.append(now - issued)
+            outcome = "ok" if text.startswith("<b>SudoLink results") else "error_reply"
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+            self._last_reply_at = now
+        return {
+            "message_id": self._next_update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": self._bot_user,
+            "text": text,
+        }
+
+    def _emit(self, text: str) -> None:
+        update_id = self._next_update_id
+        self._next_update_id += 1
+        chat_id = 100_000 + update_id
+        command_length = len(text.split(" ", 1)[0])
+        self._updates.append(
+            {
+                "update_id": update_id,
+                "message": {
+                    "message_id": update_id,
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+                    "text": text,
+                    "entities": [{"type": "bot_command", "offset": 0, "length": command_length}],
+                },
+            }
+        )
+        self._issued[chat_id] = time.perf_counter()
+        self._sent += 1
+        self._arrived.set()
+
+    async def _generate(self, rate: float, duration: float, texts: list[str], seed: int) -> None:
+        rng = random.Random(seed)
+        deadline = self._started_at + duration
+        index = 0
+        next_at = self._started_at
+        while next_at < deadline:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._emit(texts[index % len(texts)])
+            index += 1
+            next_at += rng.expovariate(rate)  # Poisson arrivals
+
+    async def _control(self, request: Request) -> Response:
+        if request.path == "/_harness/start":
+            spec = json.loads(request.body)
+            self._started_at = time.perf_counter()
+            self._generator = asyncio.create_task(
+                self._generate(spec["rate"], spec["duration"], spec["texts"], spec.get("seed", 1))
+            )
+            return Response.json({"started": True})
+        if request.path == "/_harness/report":
+            generating = self._generator is not None and not self._generator.done()
+            end = self._last_reply_at or time.perf_counter()
+            return Response.json(
+                {
+                    "generating": generating,
+                    "sent": self._sent,
+                    "answered": len(self._latencies),
+                    "pending": len(self._issued),
+                    "outcomes": self._outcomes,
+                    "latencies": self._latencies,
+                    "elapsed": max(end - self._started_at, 1e-9) if self._started_at else 0.0,
+                }
+            )
+        return Response.json({"error": "unknown control"}, status=404)
+
+
+def _ok(result: Any) -> Response:
+    return Response.json({"ok": True, "result": result})
+
+
+def _bot_params(request: Request) -> dict[str, Any]:
+    # python-telegram-bot posts urlencoded form data whose non-string values are JSON encoded.
+    if request.headers.get("content-type", "").startswith("application/json"):
+        return json.loads(request.body or b"{}")
+    raw = dict(parse_qsl(request.body.decode("utf-8") or request.query, keep_blank_values=True))
+    params: dict[str, Any] = {}
+    for key, value in raw.items():
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+def serve(config: dict[str, Any], conn: Connection) -> None:
+    """Child-process entry point: start the fakes and report their ports on `conn`."""
+
+    asyncio.run(_serve(FakeConfig(**config), conn))
+
+
+async def _serve(config: FakeConfig, conn: Connection) -> None:
+    openai, telegram, publisher = FakeOpenAI(config), FakeTelegram(), FakePublisher(config)
+    servers = {
+        "openai": HttpServer(openai.handle),
+        "telegram": HttpServer(telegram.handle),
+        "publisher": HttpServer(publisher.handle),
+    }
+    for server in servers.values():
+        await server.start()
+    conn.send({name: server.port for name, server in servers.items()})
+    loop = asyncio.get_running_loop()
+    # Block until the parent asks for stats (and then exit).
+    await loop.run_in_executor(None, conn.recv)
+    conn.send({"openai": openai.stats, "publisher": publisher.stats, "config": asdict(config)})
+    for server in servers.values():
+        await server.stop()
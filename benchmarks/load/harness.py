@@ -0,0 +1,171 @@
+"Drive the real bot stack against the local fakes and summarise capacity."
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import resource
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import httpx
+
+from benchmarks.load import fakes
+from benchmarks.load.fakes import FakeConfig
+from sudolink.bot.app import create_application
+from sudolink.config import Settings
+from sudolink.metrics import OPENAI_TOKENS_TOTAL, PROMPT_TOKENS_SAVED_TOTAL, STAGE_SECONDS
+from sudolink.services.factory import build_link_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class LoadSpec:
+    rate: float = 5.0
+    duration: float = 30.0
+    concurrent_updates: int = 64
+    unique_articles: int = 0
+    cache: bool = False
+    prompt_token_budget: int = 600
+    drain_timeout: float = 60.0
+    seed: int = 1
+    fake: FakeConfig = field(default_factory=FakeConfig)
+
+
+async def run_load(spec: LoadSpec) -> dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe()
+    process = ctx.Process(target=fakes.serve, args=(asdict(spec.fake), child_conn), daemon=True)
+    process.start()
+    try:
+        ports: dict[str, int] = await asyncio.to_thread(parent_conn.recv)
+        bot_report = await _drive(spec, ports)
+        parent_conn.send("report")
+        fake_stats = await asyncio.to_thread(parent_conn.recv)
+    finally:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+    return {"spec": _spec_dict(spec), **bot_report, "upstream": fake_stats}
+
+
+async def _drive(spec: LoadSpec, ports: dict[str, int]) -> dict[str, Any]:
+    settings = Settings(
+        telegram_bot_token="123456:LOADTEST",
+        openai_api_key="sk-loadtest",
+        telegram_base_url=f"http://127.0.0.1:{ports['telegram']}/bot",
+        openai_base_url=f"http://127.0.0.1:{ports['openai']}/v1",
+        concurrent_updates=spec.concurrent_updates,
+        cache_ttl=3600.0 if spec.cache else 0.0,
+        prompt_token_budget=spec.prompt_token_budget,
+        log_level="WARNING",
+    )
+    pool = spec.unique_articles or max(1, int(spec.rate * spec.duration * 2))
+    texts = [
+        f"/links http://127.0.0.1:{ports['publisher']}/article/{index}" for index in range(pool)
+    ]
+    rss_start = _rss_bytes()
+    rss_peak = rss_start
+    async with httpx.AsyncClient(timeout=settings.http_timeout, trust_env=False) as http_client, \
+            httpx.AsyncClient(base_url=f"http://127.0.0.1:{ports['telegram']}", trust_env=False) as control:
+        service = build_link_service(settings, http_client)
+        application = create_application(settings, service)
+        await application.initialize()
+        await application.start()
+        await application.updater.start_polling(poll_interval=0.0, timeout=5)
+        try:
+            await control.post(
+                "/_harness/start",
+                json={"rate": spec.rate, "duration": spec.duration, "texts": texts, "seed": spec.seed},
+            )
+            deadline = time.perf_counter() + spec.duration + spec.drain_timeout
+            while True:
+                await asyncio.sleep(0.5)
+                rss_peak = max(rss_peak, _rss_bytes())
+                report = (await control.get("/_harness/report")).json()
+                if not report["generating"] and report["pending"] == 0:
+                    break
+                if time.perf_counter() > deadline:
+                    logger.warning("Drain timeout: %d requests still unanswered", report["pending"])
+                    break
+        finally:
+            await application.updater.stop()
+            await application.bot_data["prefetcher"].close()
+            await application.stop()
+            await application.shutdown()
+
+    latencies = sorted(report["latencies"])
+    return {
+        "requests": {
+            "sent": report["sent"],
+            "answered": report["answered"],
+            "unanswered": report["pending"],
+            "outcomes": report["outcomes"],
+            "error_rate": _ratio(report["sent"] - report["outcomes"].get("ok", 0), report["sent"]),
+        },
+        "throughput_rps": _ratio(report["answered"], report["elapsed"]),
+        "offered_rps": spec.rate,
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(latencies[-1] * 1000, 1) if latencies else None,
+        },
+        "memory_mb": {
+            "rss_start": round(rss_start / 2**20, 1),
+            "rss_peak": round(max(rss_peak, _rss_bytes()) / 2**20, 1),
+            "rss_end": round(_rss_bytes() / 2**20, 1),
+        },
+        "stage_mean_ms": _stage_means(),
+        "openai_tokens": _token_totals(),
+    }
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    rank = max(0, min(len(values) - 1, int(round(pct / 100 * len(values) + 0.5)) - 1))
+    return round(values[rank] * 1000, 1)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+def _stage_means() -> dict[str, float]:
+    means: dict[str, float] = {}
+    for (stage,), child in STAGE_SECONDS._children.items():
+        if child.count:
+            means[stage] = round(child.sum / child.count * 1000, 2)
+    return means
+
+
+def _token_totals() -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for (_model, kind), child in OPENAI_TOKENS_TOTAL._children.items():
+        totals[kind] = totals.get(kind, 0) + child.value
+    totals["saved_by_compaction"] = PROMPT_TOKENS_SAVED_TOTAL.labels().value
+    calls = STAGE_SECONDS.labels("openai").count
+    if calls:
+        totals["prompt_per_request"] = round(totals.get("prompt", 0) / calls, 1)
+        totals["completion_per_request"] = round(totals.get("completion", 0) / calls, 1)
+    return totals
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux; good enough as a fallback elsewhere.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _spec_dict(spec: LoadSpec) -> dict[str, Any]:
+    data = asdict(spec)
+    data["fake"] = asdict(spec.fake)
+    return data
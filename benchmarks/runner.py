@@ -0,0 +1,169 @@
+"Timing loop, result files and run-to-run comparison."
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
+
+SCHEMA_VERSION = 1
+
+BenchFactory = Callable[[], Callable[[], object]]
+
+
+@dataclass(slots=True)
+class Benchmark:
+    name: str
+    factory: BenchFactory
+    group: str
+
+
+_REGISTRY: dict[str, Benchmark] = {}
+
+
+def register(name: str, factory: BenchFactory, *, group: str) -> None:
+    """Register `factory`, which builds inputs and returns the callable to time."""
+
+    if name in _REGISTRY:
+        raise ValueError(f"Benchmark {name} already registered")
+    _REGISTRY[name] = Benchmark(name=name, factory=factory, group=group)
+
+
+def registered(pattern: str | None = None) -> list[Benchmark]:
+    return [bench for name, bench in _REGISTRY.items() if not pattern or pattern in name]
+
+
+def measure(func: Callable[[], object], *, min_time: float, repeats: int) -> dict[str, float]:
+    """Return per-call timings (seconds) for `func`, auto-scaling the loop count."""
+
+    func()  # warm caches and lazy imports outside the timed region
+    loops = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= min_time / 5 or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 50 else 2
+    loops = max(1, int(loops * (min_time / max(elapsed, 1e-9))))
+    samples = [_time_loops(func, loops) / loops for _ in range(repeats)]
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.pstdev(samples),
+        "loops": loops,
+        "repeats": repeats,
+    }
+
+
+def _time_loops(func: Callable[[], object], loops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - started
+
+
+def run(
+    benchmarks: Iterable[Benchmark],
+    *,
+    min_time: float = 0.2,
+    repeats: int = 5,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, object]:
+    results: dict[str, dict[str, object]] = {}
+    for bench in benchmarks:
+        func = bench.factory()
+        stats = measure(func, min_time=min_time, repeats=repeats)
+        results[bench.name] = {"group": bench.group, **stats}
+        if progress:
+            progress(f"{bench.name:<55} {_fmt_seconds(stats['median']):>12}/op  (±{_pct(stats)})")
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save(report: dict[str, object], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def load(path: str | Path) -> dict[str, object]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark schema {report.get('schema')!r}")
+    return report
+
+
+@dataclass(slots=True)
+class Comparison:
+    name: str
+    baseline: float | None
+    current: float | None
+    status: str
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline
+
+
+def compare(
+    baseline: dict[str, object], current: dict[str, object], *, threshold: float = 0.10
+) -> list[Comparison]:
+    """Classify each benchmark by median change; `threshold` is a fraction (0.10 = 10%)."""
+
+    base_results: dict[str, dict] = baseline["results"]  # type: ignore[assignment]
+    new_results: dict[str, dict] = current["results"]  # type: ignore[assignment]
+    rows: list[Comparison] = []
+    for name in sorted(set(base_results) | set(new_results)):
+        old = base_results.get(name, {}).get("median")
+        new = new_results.get(name, {}).get("median")
+        if old is None:
+            status = "new"
+        elif new is None:
+            status = "missing"
+        elif new > old * (1 + threshold):
+            status = "regression"
+        elif new < old * (1 - threshold):
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append(Comparison(name=name, baseline=old, current=new, status=status))
+    return rows
+
+
+def format_comparison(rows: list[Comparison]) -> str:
+    lines = [f"{'benchmark':<55} {'baseline':>12} {'current':>12} {'change':>9}  status"]
+    for row in rows:
+        ratio = row.ratio
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "-"
+        lines.append(
+            f"{row.name:<55} {_fmt_seconds(row.baseline):>12} {_fmt_seconds(row.current):>12} "
+            f"{change:>9}  {row.status.upper() if row.status == 'regression' else row.status}"
+        )
+    return "\n".join(lines)
+
+
+def _fmt_seconds(value: float | None) -> str:
+    if value is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value / 1e-9:.0f} ns"
+
+
+def _pct(stats: dict[str, float]) -> str:
+    if not stats["median"]:
+        return "0%"
+    return f"{stats['stdev'] / stats['median'] * 100:.1f}%"
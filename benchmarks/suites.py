@@ -0,0 +1,110 @@
+"Benchmark definitions for the pipeline hot paths."
+
+from __future__ import annotations
+
+from benchmarks import corpora
+from benchmarks.runner import register
+from sudolink.core.link_extractor import first_url_from_message, normalize_url
+from sudolink.core.meta_fetcher import parse_metadata
+from sudolink.core.result_curator import ResultCurator
+from sudolink.services.ai_expansion import AIExpansionService
+from sudolink.ui.formatter import format_bundle
+
+MESSAGE_CORPUS = 2_000
+URL_CORPUS = 5_000
+HTML_SIZES = {"10kb": 10_000, "100kb": 100_000, "1mb": 1_000_000}
+CURATE_SIZES = (10, 1_000, 20_000)
+FINGERPRINT_CORPUS = 10_000
+PAYLOAD_SIZES = (10, 1_000, 10_000)
+PROMPT_DESCRIPTION_WORDS = (50, 2_000)
+
+
+def _extract_messages():
+    messages = corpora.messages(MESSAGE_CORPUS)
+
+    def run() -> None:
+        for message in messages:
+            first_url_from_message(message)
+
+    return run
+
+
+def _normalize_urls():
+    urls = corpora.raw_urls(URL_CORPUS)
+
+    def run() -> None:
+        for url in urls:
+            normalize_url(url)
+
+    return run
+
+
+def _parse_html(size: int):
+    def factory():
+        html = corpora.article_html(size)
+        return lambda: parse_metadata("https://news.example.com/story", html)
+
+    return factory
+
+
+def _curate(count: int):
+    def factory():
+        results = corpora.search_results(count)
+        curator = ResultCurator()
+        return lambda: curator.curate(results, 8)
+
+    return factory
+
+
+def _fingerprint():
+    results = corpora.search_results(FINGERPRINT_CORPUS, duplicate_ratio=0.0)
+
+    def run() -> None:
+        for result in results:
+            result.fingerprint()
+
+    return run
+
+
+def _parse_links(count: int):
+    def factory():
+        payload = corpora.openai_payload(count)
+        service = AIExpansionService(client=None, model="bench", insight_limit=6)  # type: ignore[arg-type]
+        links = payload["related_links"]
+        return lambda: service._parse_links(links, count)
+
+    return factory
+
+
+def _build_messages(description_words: int):
+    def factory():
+        meta = corpora.article_meta(description_words)
+        service = AIExpansionService(client=None, model="bench", insight_limit=3)  # type: ignore[arg-type]
+        return lambda: service._build_messages(meta, 4)
+
+    return factory
+
+
+def _format(related: int, insights: int):
+    def factory():
+        item = corpora.bundle(related, insights)
+        return lambda: format_bundle(item)
+
+    return factory
+
+
+register(f"link_extractor.first_url_from_message[{MESSAGE_CORPUS} msgs]", _extract_messages, group="extract")
+register(f"link_extractor.normalize_url[{URL_CORPUS} urls]", _normalize_urls, group="extract")
+for label, size in HTML_SIZES.items():
+    register(f"meta_fetcher.parse_metadata[{label}]", _parse_html(size), group="parse")
+for count in CURATE_SIZES:
+    register(f"result_curator.curate[{count} candidates]", _curate(count), group="curate")
+register(f"SearchResult.fingerprint[{FINGERPRINT_CORPUS} results]", _fingerprint, group="curate")
+for count in PAYLOAD_SIZES:
+    register(f"ai_expansion._parse_links[{count} links]", _parse_links(count), group="openai")
+for words in PROMPT_DESCRIPTION_WORDS:
+    register(
+        f"ai_expansion._build_messages[{words} word description]", _build_messages(words), group="openai"
+    )
+register("formatter.format_bundle[4 links, 3 insights]", _format(4, 3), group="format")
+register("formatter.format_bundle[50 links, 20 insights]", _format(50, 20), group="format")
@@ -7,16 +7,20 @@ import logging
 import os
 from pathlib import Path
 import signal
+import sys
+from typing import Sequence
 
 import httpx
-from openai import AsyncOpenAI
 
+from sudolink.batch import main as batch_main
 from sudolink.bot.app import create_application
+from sudolink.bot.handlers import replay_journal
 from sudolink.config import Settings
-from sudolink.core.meta_fetcher import MetaFetcher
-from sudolink.core.result_curator import ResultCurator
-from sudolink.services.ai_expansion import AIExpansionService
-from sudolink.services.link_service import LinkService
+from sudolink.metrics import MetricsServer
+from sudolink.profiling import Profiler
+from sudolink.tracing import JsonFormatter
+from sudolink.services.factory import build_link_service
+from sudolink.services.journal import RequestJournal
 
 logger = logging.getLogger(__name__)
 
@@ -39,37 +43,46 @@ def _load_local_env() -> None:
         os.environ.setdefault(key, value)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
     _load_local_env()
+    if args and args[0] == "batch":
+        raise SystemExit(batch_main(args[1:]))
     settings = Settings.from_env()
+    _configure_logging(settings)
+    logger.info("Starting SudoLink")
+    asyncio.run(_run(settings))
+
+
+def _configure_logging(settings: Settings) -> None:
     logging.basicConfig(
         level=settings.log_level,
         format="%(asctime)s %(levelname)s %(name)s %(message)s",
     )
-    logger.info("Starting SudoLink")
-    asyncio.run(_run(settings))
+    if settings.log_format == "json":
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(JsonFormatter())
 
 
 async def _run(settings: Settings) -> None:
     async with httpx.AsyncClient(timeout=settings.http_timeout) as http_client:
-        meta_fetcher = MetaFetcher(
-            client=http_client, user_agent=settings.user_agent, timeout=settings.http_timeout
+        service = build_link_service(settings, http_client)
+        if settings.cache_file and service.cache is not None:
+            loaded = service.cache.load(settings.cache_file)
+            logger.info("Loaded %d cached bundles from %s", loaded, settings.cache_file)
+        profiler = Profiler(
+            output_dir=settings.profile_dir, slow_callback_ms=settings.slow_callback_ms
         )
-        curator = ResultCurator()
-        openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
-        ai_service = AIExpansionService(
-            client=openai_client,
-            model=settings.openai_model,
-            insight_limit=settings.insight_limit,
-        )
-        service = LinkService(
-            meta_fetcher=meta_fetcher,
-            ai_service=ai_service,
-            result_curator=curator,
-        )
-        application = create_application(settings, service)
+        journal = RequestJournal(settings.journal_path)
+        await journal.open()
+        application = create_application(settings, service, profiler, journal)
+        metrics_server = None
+        if settings.metrics_port:
+            metrics_server = MetricsServer(host=settings.metrics_host, port=settings.metrics_port)
+            await metrics_server.start()
         await application.initialize()
         await application.start()
+        await replay_journal(application)
         await application.updater.start_polling()
         logger.info("Bot is polling for updates.")
         stop_event = asyncio.Event()
@@ -79,6 +92,7 @@ async def _run(settings: Settings) -> None:
                 loop.add_signal_handler(sig, stop_event.set)
             except NotImplementedError:
                 pass
+        profiler.install_signal_handlers()
         try:
             await stop_event.wait()
         except asyncio.CancelledError:
@@ -86,8 +100,32 @@ async def _run(settings: Settings) -> None:
             raise
         finally:
             await application.updater.stop()
+            # Inline prefetches are best effort: stop them before the client and cache go away.
+            await application.bot_data["prefetcher"].close()
+            await _drain(application, journal, settings.shutdown_grace)
             await application.stop()
             await application.shutdown()
+            await journal.close()
+            profiler.shutdown()
+            if metrics_server is not None:
+                await metrics_server.stop()
+            if settings.cache_file and service.cache is not None:
+                service.cache.dump(settings.cache_file)
+
+
+async def _drain(application, journal: RequestJournal, grace: float) -> None:
+    """Give queued, waiting and running updates `grace` seconds, then cancel the rest.
+
+    PTB calls `update_queue.task_done()` only after an update's handlers have
+    finished, so `join()` also covers updates already taken off the queue that
+    are still waiting for a pipeline slot. Cancelled leftovers stay journaled.
+    """
+
+    try:
+        await asyncio.wait_for(application.update_queue.join(), grace)
+    except asyncio.TimeoutError:
+        logger.warning("Shutdown grace period of %.0fs ran out with updates unfinished", grace)
+    await journal.drain(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,243 @@
+"""Offline batch runner: `python -m sudolink batch`.
+
+Reads URLs (or `/chishiki`-style context snippets) from a file or stdin, runs
+them through `LinkService` with bounded concurrency and streams one JSON
+record per input to the output in completion order.
+
+Input lines are either bare values or JSON objects such as
+``{"url": "https://..."}`` / ``{"context": "...", "label": "...", "id": "..."}``.
+Blank lines and lines starting with ``#`` are ignored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Sequence
+
+import httpx
+
+from sudolink.config import Settings
+from sudolink.core.link_extractor import normalize_url
+from sudolink.exceptions import LinkExtractionError, SudoLinkError
+from sudolink.services.factory import build_link_service
+from sudolink.services.link_service import LinkService
+
+logger = logging.getLogger(__name__)
+
+KIND_URL = "url"
+KIND_CONTEXT = "context"
+
+
+@dataclass(slots=True)
+class BatchItem:
+    item_id: str
+    kind: str
+    value: str
+    label: str | None = None
+
+
+def parse_items(lines: Iterable[str], *, default_kind: str = KIND_URL) -> Iterator[BatchItem]:
+    for line_no, raw in enumerate(lines, start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        item_id: str | None = None
+        label: str | None = None
+        kind = default_kind
+        value = line
+        if line.startswith("{"):
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as exc:
+                logger.warning("Skipping malformed JSON on line %d: %s", line_no, exc)
+                continue
+            if data.get("url"):
+                kind, value = KIND_URL, str(data["url"]).strip()
+            elif data.get("context") or data.get("text"):
+                kind, value = KIND_CONTEXT, str(data.get("context") or data.get("text")).strip()
+            else:
+                logger.warning("Skipping line %d: expected a 'url' or 'context' key", line_no)
+                continue
+            item_id = str(data["id"]) if data.get("id") is not None else None
+            label = str(data["label"]) if data.get("label") else None
+        if item_id is None:
+            item_id = hashlib.sha1(f"{kind}\n{value}".encode("utf-8")).hexdigest()[:16]
+        yield BatchItem(item_id=item_id, kind=kind, value=value, label=label)
+
+
+def load_checkpoint(path: Path | None) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+
+async def run_batch(
+    service: LinkService,
+    items: Iterable[BatchItem],
+    *,
+    output: IO[str],
+    limit: int,
+    concurrency: int = 4,
+    checkpoint: IO[str] | None = None,
+    done: set[str] | None = None,
+) -> dict[str, int]:
+    """Process `items` and return counters for the run summary.
+
+    Successful item ids are appended to `checkpoint` as soon as their record
+    is written, so an interrupted run can resume; failures are retried.
+    """
+
+    done = done or set()
+    stats = {"ok": 0, "failed": 0, "skipped": 0}
+    queue: asyncio.Queue[BatchItem | None] = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                record = await _process(service, item, limit=limit)
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                if record["ok"]:
+                    stats["ok"] += 1
+                    if checkpoint is not None:
+                        checkpoint.write(item.item_id + "\n")
+                        checkpoint.flush()
+                else:
+                    stats["failed"] += 1
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        seen: set[str] = set()
+        pending = iter(items)
+        # Reading (stdin in particular) blocks; do it off the loop so workers keep running.
+        while (item := await asyncio.to_thread(next, pending, None)) is not None:
+            if item.item_id in done or item.item_id in seen:
+                stats["skipped"] += 1
+                continue
+            seen.add(item.item_id)
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    return stats
+
+
+async def _process(service: LinkService, item: BatchItem, *, limit: int) -> dict[str, object]:
+    record: dict[str, object] = {"id": item.item_id, "kind": item.kind, "input": item.value}
+    started = time.perf_counter()
+    try:
+        if item.kind == KIND_URL:
+            url = normalize_url(item.value)
+            if not url:
+                raise LinkExtractionError(f"Not a usable URL: {item.value!r}")
+            bundle = await service.generate_bundle(url, limit=limit)
+        else:
+            label = item.label or item.value.splitlines()[0][:80]
+            bundle = await service.generate_from_context(
+                context_text=item.value, limit=limit, reference_label=label
+            )
+    except SudoLinkError as exc:
+        record.update(ok=False, error={"type": type(exc).__name__, "message": str(exc)})
+    except Exception as exc:  # keep the batch going; the record carries the failure
+        logger.exception("Unexpected failure for batch item %s", item.item_id)
+        record.update(ok=False, error={"type": type(exc).__name__, "message": str(exc)})
+    else:
+        record.update(ok=True, bundle=bundle.as_dict())
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m sudolink batch",
+        description="Generate link bundles offline and stream them as JSONL.",
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="File with one URL/context/JSON object per line (default: stdin)."
+    )
+    parser.add_argument(
+        "--context", action="store_true", help="Treat bare lines as context text instead of URLs."
+    )
+    parser.add_argument("-o", "--output", help="Append JSONL records to this file (default: stdout).")
+    parser.add_argument("-j", "--concurrency", type=int, default=4, help="Parallel pipeline runs (default: 4).")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Links per bundle (default: SUDOLINK_RESULT_LIMIT; must match the bot to warm its cache).",
+    )
+    parser.add_argument("--checkpoint", help="File recording finished item ids; reruns skip them.")
+    parser.add_argument(
+        "--cache-file",
+        help="Bundle cache snapshot to load before and save after the run (default: SUDOLINK_CACHE_FILE).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    settings = Settings.from_env(require_telegram=False)
+    logging.basicConfig(
+        level=settings.log_level,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        stream=sys.stderr,
+    )
+    try:
+        stats = asyncio.run(_run(settings, args))
+    except KeyboardInterrupt:
+        logger.warning("Batch interrupted; rerun with the same --checkpoint to resume.")
+        return 130
+    logger.info(
+        "Batch finished: %d ok, %d failed, %d skipped", stats["ok"], stats["failed"], stats["skipped"]
+    )
+    return 1 if stats["failed"] else 0
+
+
+async def _run(settings: Settings, args: argparse.Namespace) -> dict[str, int]:
+    limit = args.limit or settings.max_results
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else None
+    cache_file = args.cache_file or settings.cache_file
+    default_kind = KIND_CONTEXT if args.context else KIND_URL
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if not args.output else open(args.output, "a", encoding="utf-8")
+    checkpoint = checkpoint_path.open("a", encoding="utf-8") if checkpoint_path else None
+    try:
+        async with httpx.AsyncClient(timeout=settings.http_timeout) as http_client:
+            service = build_link_service(settings, http_client)
+            if cache_file and service.cache is not None:
+                loaded = service.cache.load(cache_file)
+                logger.info("Loaded %d cached bundles from %s", loaded, cache_file)
+            try:
+                return await run_batch(
+                    service,
+                    parse_items(source, default_kind=default_kind),
+                    output=output,
+                    limit=limit,
+                    concurrency=args.concurrency,
+                    checkpoint=checkpoint,
+                    done=load_checkpoint(checkpoint_path),
+                )
+            finally:
+                if cache_file and service.cache is not None:
+                    saved = service.cache.dump(cache_file)
+                    logger.info("Saved %d cached bundles to %s", saved, cache_file)
+    finally:
+        for handle in (source, output, checkpoint):
+            if handle is not None and handle not in (sys.stdin, sys.stdout):
+                handle.close()
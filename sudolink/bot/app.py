@@ -2,40 +2,102 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any, Awaitable
 
-from telegram.ext import Application, ApplicationBuilder, CommandHandler, MessageHandler, filters
+from telegram import Update
+from telegram.ext import (
+    Application,
+    ApplicationBuilder,
+    BaseUpdateProcessor,
+    CommandHandler,
+    InlineQueryHandler,
+    MessageHandler,
+    filters,
+)
 
 from sudolink.bot.handlers import (
     chishiki_command,
+    debug_command,
     help_command,
+    inline_query,
     links_command,
     private_plain_text,
     start_command,
 )
 from sudolink.config import Settings
+from sudolink.profiling import Profiler
+from sudolink.services.journal import RequestJournal
 from sudolink.services.link_service import LinkService
+from sudolink.services.prefetch import Prefetcher
 
 logger = logging.getLogger(__name__)
 
+# Updates PTB may hold while they wait for a pipeline slot; inline queries bypass that wait.
+_UPDATE_BACKLOG = 1024
 
-def create_application(settings: Settings, service: LinkService) -> Application:
-    application = (
-        ApplicationBuilder()
-            .token(settings.telegram_bot_token)
-            .build()
-    )
+
+class _UpdateProcessor(BaseUpdateProcessor):
+    """Limits pipeline updates to `pipeline_slots` but never queues inline queries behind them.
+
+    PTB's default processor with one slot awaits every handler in turn, so an
+    inline keystroke would wait out a multi-second `/links` OpenAI call and
+    Telegram would expire the query.
+    """
+
+    def __init__(self, pipeline_slots: int) -> None:
+        super().__init__(max_concurrent_updates=pipeline_slots + _UPDATE_BACKLOG)
+        self._pipeline = asyncio.BoundedSemaphore(pipeline_slots)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        if isinstance(update, Update) and update.inline_query is not None:
+            await coroutine
+            return
+        async with self._pipeline:
+            await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+def create_application(
+    settings: Settings,
+    service: LinkService,
+    profiler: Profiler | None = None,
+    journal: RequestJournal | None = None,
+) -> Application:
+    builder = ApplicationBuilder().token(settings.telegram_bot_token)
+    if settings.telegram_base_url:
+        builder = builder.base_url(settings.telegram_base_url)
+    builder = builder.concurrent_updates(_UpdateProcessor(settings.concurrent_updates))
+    application = builder.build()
     application.bot_data["link_service"] = service
     application.bot_data["settings"] = settings
+    application.bot_data["profiler"] = profiler or Profiler(
+        output_dir=settings.profile_dir, slow_callback_ms=settings.slow_callback_ms
+    )
+    # Without an explicit journal requests are still tracked for draining, just not persisted.
+    application.bot_data["journal"] = journal or RequestJournal(None)
+    application.bot_data["prefetcher"] = Prefetcher(
+        service,
+        debounce=settings.inline_debounce,
+        max_running=settings.inline_prefetch_limit,
+    )
 
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("links", links_command))
     application.add_handler(CommandHandler("chishiki", chishiki_command))
+    application.add_handler(CommandHandler("debug", debug_command))
     application.add_handler(
         MessageHandler(
             filters.TEXT & ~filters.COMMAND & filters.ChatType.PRIVATE,
             private_plain_text,
         )
     )
+    application.add_handler(InlineQueryHandler(inline_query))
     return application
@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
-from typing import Sequence
-
-from telegram import Update
+from typing import Awaitable, Callable, Coroutine, Sequence
+from urllib.parse import urlparse
+
+from telegram import (
+    InlineQueryResultArticle,
+    InlineQueryResultsButton,
+    InputTextMessageContent,
+    ReplyParameters,
+    Update,
+)
 from telegram.constants import ChatAction, ChatType, ParseMode
-from telegram.ext import ContextTypes
+from telegram.ext import Application, ContextTypes
 
 from sudolink.config import Settings
 from sudolink.core.link_extractor import first_url_from_message, normalize_url
@@ -17,11 +26,50 @@ from sudolink.exceptions import (
     SearchProviderError,
     SudoLinkError,
 )
+from sudolink.metrics import REQUESTS_IN_FLIGHT, REQUESTS_TOTAL, track_stage
+from sudolink.profiling import Profiler
+from sudolink.services.journal import JournalEntry, RequestDeferred, RequestJournal
 from sudolink.services.link_service import LinkService
+from sudolink.services.prefetch import Prefetcher
+from sudolink.tracing import log_trace, start_trace
+from sudolink.types import LinkBundle
 from sudolink.ui.formatter import format_bundle
 
 logger = logging.getLogger(__name__)
 
+_Handler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[str | None]]
+_Reply = Callable[..., Awaitable[object]]
+
+# Telegram caches inline answers per query string; hits are stable, misses must not be.
+INLINE_HIT_CACHE_TIME = 300
+INLINE_HINT_CACHE_TIME = 3600
+
+
+def _instrumented(command: str) -> Callable[[_Handler], Callable[..., Awaitable[None]]]:
+    """Count and trace requests; the wrapped handler returns its outcome label."""
+
+    def decorator(func: _Handler) -> Callable[..., Awaitable[None]]:
+        @functools.wraps(func)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            in_flight = REQUESTS_IN_FLIGHT.labels(command)
+            in_flight.inc()
+            outcome = "error"
+            chat = update.effective_chat
+            with start_trace(
+                command, update_id=update.update_id, chat_id=chat.id if chat else None
+            ) as trace:
+                try:
+                    outcome = await func(update, context) or "ok"
+                finally:
+                    in_flight.dec()
+                    REQUESTS_TOTAL.labels(command, outcome).inc()
+                    if outcome != "ignored":
+                        log_trace(trace, outcome)
+
+        return wrapper
+
+    return decorator
+
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.effective_message.reply_text(_start_text())
@@ -31,115 +79,330 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     await update.effective_message.reply_text(_help_text())
 
 
-async def chishiki_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@_instrumented("chishiki")
+async def chishiki_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> str | None:
     """Context-only command for plain text posts."""
 
     message = update.effective_message
     service = _get_service(context)
     settings = _get_settings(context)
 
-    context_text = _extract_context_text(message, context.args)
+    with track_stage("extract"):
+        context_text = _extract_context_text(message, context.args)
     if not context_text:
         await message.reply_text(
             "Share a quick summary or reply to a message so I have context to work with."
         )
-        return
+        return "no_input"
 
     label = context_text.strip().splitlines()[0][:80]
-    if update.effective_chat:
-        await context.bot.send_chat_action(
-            chat_id=update.effective_chat.id, action=ChatAction.TYPING
-        )
 
-    try:
-        bundle = await service.generate_from_context(
-            context_text=context_text,
-            limit=settings.max_results,
-            reference_label=label,
-        )
-    except SearchProviderError as exc:
-        logger.warning("Context search provider error: %s", exc)
-        await message.reply_text(str(exc))
-        return
-    except SudoLinkError as exc:
-        logger.exception("Unexpected context error")
-        await message.reply_text(f"Something went wrong: {exc}")
-        return
-
-    response_text = format_bundle(bundle)
-    logger.debug("chishiki response:\n%s", response_text)
-    await message.reply_text(
-        response_text,
-        parse_mode=ParseMode.HTML,
-        disable_web_page_preview=True,
+    return await _journaled(
+        context,
+        message,
+        kind="chishiki",
+        payload=context_text,
+        label=label,
+        work=_answer_context(
+            message.reply_text, service, context_text, label, limit=settings.max_results
+        ),
     )
 
 
-async def links_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@_instrumented("links")
+async def links_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> str | None:
     message = update.effective_message
     service = _get_service(context)
     settings = _get_settings(context)
 
     try:
-        url = _resolve_url(message, context.args)
+        with track_stage("extract"):
+            url = _resolve_url(message, context.args)
     except LinkExtractionError as exc:
         await message.reply_text(str(exc))
-        return
+        return "no_input"
+
+    return await _journaled(
+        context,
+        message,
+        kind="links",
+        payload=url,
+        work=_answer_url(message.reply_text, service, url, limit=settings.max_results),
+    )
 
-    if update.effective_chat:
-        await context.bot.send_chat_action(
-            chat_id=update.effective_chat.id, action=ChatAction.TYPING
+
+@_instrumented("private")
+async def private_plain_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> str | None:
+    chat = update.effective_chat
+    if not chat or chat.type != ChatType.PRIVATE:
+        return "ignored"
+    message = update.effective_message
+    if not message or not message.text:
+        return "ignored"
+    service = _get_service(context)
+    settings = _get_settings(context)
+    with track_stage("extract"):
+        url = first_url_from_message(message)
+    if not url:
+        return "ignored"
+    return await _journaled(
+        context,
+        message,
+        kind="private",
+        payload=url,
+        work=_answer_url(
+            message.reply_text, service, url, limit=settings.max_results, plain_errors=True
+        ),
+    )
+
+
+@_instrumented("inline")
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> str | None:
+    """Answer `@bot <url>` from the result cache; never waits on the pipeline.
+
+    On a miss the expansion is scheduled in the background (debounced per user,
+    since queries arrive on every keystroke) and an empty answer tells the user
+    to retry shortly, by which time the bundle is usually cached.
+    """
+
+    query = update.inline_query
+    if query is None:
+        return "ignored"
+    with track_stage("extract"):
+        url = _inline_url(query.query)
+    if url is None:
+        await query.answer(
+            [],
+            cache_time=INLINE_HINT_CACHE_TIME,
+            button=InlineQueryResultsButton(text="Paste a news link", start_parameter="inline"),
+        )
+        return "ignored"
+
+    service = _get_service(context)
+    settings = _get_settings(context)
+    bundle = service.cached_bundle(url, limit=settings.max_results)
+    if bundle is not None:
+        with track_stage("format"):
+            result = InlineQueryResultArticle(
+                id=hashlib.sha1(url.encode("utf-8")).hexdigest(),
+                title=bundle.original.title or bundle.original.host or "SudoLink results",
+                description=_inline_description(bundle),
+                input_message_content=InputTextMessageContent(
+                    format_bundle(bundle),
+                    parse_mode=ParseMode.HTML,
+                    disable_web_page_preview=True,
+                ),
+            )
+        with track_stage("send"):
+            await query.answer([result], cache_time=INLINE_HIT_CACHE_TIME)
+        return "hit"
+
+    if service.cache is None or not service.cache.enabled:
+        await query.answer(
+            [],
+            cache_time=INLINE_HINT_CACHE_TIME,
+            button=InlineQueryResultsButton(
+                text="Inline mode is off here; DM me the link", start_parameter="inline"
+            ),
+        )
+        return "unavailable"
+    _prefetcher(context.application).schedule(
+        query.from_user.id, url, limit=settings.max_results
+    )
+    await query.answer(
+        [],
+        cache_time=0,
+        is_personal=True,
+        button=InlineQueryResultsButton(
+            text="Gathering coverage… try again in a few seconds", start_parameter="inline"
+        ),
+    )
+    return "miss"
+
+
+async def replay_journal(application: Application) -> int:
+    """Answer requests a previous process accepted but never replied to."""
+
+    journal = _journal(application)
+    entries = await journal.unfinished()
+    for entry in entries:
+        journal.track(entry)
+        application.create_task(_replay(application, entry), name=f"replay-{entry.entry_id}")
+    if entries:
+        logger.info("Replaying %d journaled requests", len(entries))
+    return len(entries)
+
+
+async def _replay(application: Application, entry: JournalEntry) -> None:
+    service: LinkService = application.bot_data["link_service"]
+    settings: Settings = application.bot_data["settings"]
+    reply_parameters = (
+        ReplyParameters(message_id=entry.message_id, allow_sending_without_reply=True)
+        if entry.message_id
+        else None
+    )
+    reply = functools.partial(
+        application.bot.send_message, entry.chat_id, reply_parameters=reply_parameters
+    )
+    if entry.kind == "chishiki":
+        work = _answer_context(
+            reply, service, entry.payload, entry.label, limit=settings.max_results
+        )
+    else:
+        work = _answer_url(
+            reply,
+            service,
+            entry.payload,
+            limit=settings.max_results,
+            plain_errors=entry.kind == "private",
         )
+    outcome = "error"
+    with start_trace(f"replay_{entry.kind}", chat_id=entry.chat_id, attempt=entry.attempts) as trace:
+        try:
+            outcome = await _journal(application).run(entry.entry_id, work) or "ok"
+        except RequestDeferred:
+            outcome = "deferred"
+        finally:
+            log_trace(trace, outcome)
+
+
+async def _journaled(
+    context: ContextTypes.DEFAULT_TYPE,
+    message,
+    *,
+    kind: str,
+    payload: str,
+    work: Coroutine[object, object, str | None],
+    label: str | None = None,
+) -> str | None:
+    journal = _journal(context.application)
+    entry_id = journal.accept(
+        kind=kind,
+        chat_id=message.chat_id,
+        message_id=message.message_id,
+        payload=payload,
+        label=label,
+    )
+    try:
+        return await journal.run(entry_id, _typing(context, message.chat_id, work))
+    except RequestDeferred:
+        work.close()  # no-op unless the wrapper was dropped before it started
+        return "deferred"
+
+
+async def _typing(
+    context: ContextTypes.DEFAULT_TYPE, chat_id: int, work: Coroutine[object, object, str | None]
+) -> str | None:
+    # Runs inside the journaled task so a shutdown that cancels it keeps the entry.
+    try:
+        await context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
+    except BaseException:
+        work.close()
+        raise
+    return await work
+
 
+async def _answer_url(
+    reply: _Reply, service: LinkService, url: str, *, limit: int, plain_errors: bool = False
+) -> str | None:
     try:
-        bundle = await service.generate_bundle(url, limit=settings.max_results)
+        bundle = await service.generate_bundle(url, limit=limit)
     except MetadataFetchError as exc:
         logger.warning("Metadata fetch failed: %s", exc)
-        await message.reply_text("I couldn't read that link. Is it reachable?")
-        return
+        await reply(str(exc) if plain_errors else "I couldn't read that link. Is it reachable?")
+        return "fetch_error"
     except SearchProviderError as exc:
         logger.warning("Search provider error: %s", exc)
-        await message.reply_text(str(exc))
-        return
+        await reply(str(exc))
+        return "provider_error"
     except SudoLinkError as exc:
         logger.exception("Unexpected link error")
-        await message.reply_text(f"Something went wrong: {exc}")
-        return
+        await reply(f"Something went wrong: {exc}")
+        return "error"
 
-    response_text = format_bundle(bundle)
-    logger.debug("links_command response:\n%s", response_text)
-    await message.reply_text(
-        response_text,
-        parse_mode=ParseMode.HTML,
-        disable_web_page_preview=True,
-    )
+    await _reply_with_bundle(reply, bundle, "links")
+    return None
 
 
-async def private_plain_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    chat = update.effective_chat
-    if not chat or chat.type != ChatType.PRIVATE:
-        return
-    message = update.effective_message
-    if not message or not message.text:
-        return
-    service = _get_service(context)
+async def _answer_context(
+    reply: _Reply, service: LinkService, context_text: str, label: str | None, *, limit: int
+) -> str | None:
+    try:
+        bundle = await service.generate_from_context(
+            context_text=context_text,
+            limit=limit,
+            reference_label=label,
+        )
+    except SearchProviderError as exc:
+        logger.warning("Context search provider error: %s", exc)
+        await reply(str(exc))
+        return "provider_error"
+    except SudoLinkError as exc:
+        logger.exception("Unexpected context error")
+        await reply(f"Something went wrong: {exc}")
+        return "error"
+
+    await _reply_with_bundle(reply, bundle, "chishiki")
+    return None
+
+
+async def _reply_with_bundle(reply: _Reply, bundle: LinkBundle, log_label: str) -> None:
+    with track_stage("format"):
+        response_text = format_bundle(bundle)
+    logger.debug("%s response:\n%s", log_label, response_text)
+    with track_stage("send"):
+        await reply(
+            response_text,
+            parse_mode=ParseMode.HTML,
+            disable_web_page_preview=True,
+        )
+
+
+async def debug_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Admin-only controls: `/debug cpu|slow|mem on|off`, `/debug status`, `/debug breakers`."""
+
     settings = _get_settings(context)
-    url = first_url_from_message(message)
-    if not url:
+    user = update.effective_user
+    if not user or user.id not in settings.admin_user_ids:
         return
-    await context.bot.send_chat_action(chat_id=chat.id, action=ChatAction.TYPING)
+    profiler: Profiler = context.application.bot_data["profiler"]
+    args = [arg.lower() for arg in context.args or ()]
+    target = args[0] if args else "status"
+    action = args[1] if len(args) > 1 else "on"
+    if target == "status":
+        reply = profiler.status()
+    elif target == "breakers":
+        states = _get_service(context).breaker_status()
+        reply = ", ".join(f"{name}={state}" for name, state in states.items())
+    elif target == "cpu":
+        reply = profiler.start_cpu() if action == "on" else profiler.stop_cpu()
+    elif target == "slow":
+        if action == "on":
+            threshold = float(args[2]) if len(args) > 2 and _is_number(args[2]) else None
+            reply = profiler.start_slow_callbacks(threshold)
+        else:
+            reply = profiler.stop_slow_callbacks()
+    elif target == "mem":
+        if action == "on":
+            reply = profiler.start_memory()
+        elif action == "snapshot":
+            reply = profiler.snapshot_memory()
+        else:
+            reply = profiler.stop_memory()
+    else:
+        reply = (
+            "Usage: /debug status | breakers | cpu on|off | slow on [ms]|off | mem on|snapshot|off"
+        )
+    logger.warning("Admin %s ran /debug %s: %s", user.id, " ".join(args), reply)
+    await update.effective_message.reply_text(reply)
+
+
+def _is_number(value: str) -> bool:
     try:
-        bundle = await service.generate_bundle(url, limit=settings.max_results)
-    except (MetadataFetchError, SearchProviderError) as exc:
-        await message.reply_text(str(exc))
-        return
-    response_text = format_bundle(bundle)
-    logger.debug("private response:\n%s", response_text)
-    await message.reply_text(
-        response_text,
-        parse_mode=ParseMode.HTML,
-        disable_web_page_preview=True,
-    )
+        float(value)
+    except ValueError:
+        return False
+    return True
 
 
 def _resolve_url(message, args: Sequence[str]) -> str:
@@ -157,6 +420,22 @@ def _resolve_url(message, args: Sequence[str]) -> str:
     raise LinkExtractionError("I need a link to get started. Try /links <url>.")
 
 
+def _inline_url(text: str) -> str | None:
+    parts = text.split(maxsplit=1)
+    url = normalize_url(parts[0]) if parts else None
+    # Skip half-typed hosts ("https://exa") so keystrokes do not trigger fetches.
+    if url is None or "." not in urlparse(url).netloc.strip("."):
+        return None
+    return url
+
+
+def _inline_description(bundle: LinkBundle) -> str:
+    description = f"{len(bundle.related)} related articles"
+    if bundle.insights:
+        description += f", {len(bundle.insights)} insights"
+    return description
+
+
 def _extract_context_text(message, args: Sequence[str]) -> str | None:
     if args:
         joined = " ".join(args).strip()
@@ -181,6 +460,14 @@ def _get_settings(context: ContextTypes.DEFAULT_TYPE) -> Settings:
     return context.application.bot_data["settings"]
 
 
+def _journal(application: Application) -> RequestJournal:
+    return application.bot_data["journal"]
+
+
+def _prefetcher(application: Application) -> Prefetcher:
+    return application.bot_data["prefetcher"]
+
+
 def _start_text() -> str:
     return (
         "Hi, I’m SudoLink.\n\n"
@@ -195,6 +482,7 @@ def _help_text() -> str:
         "• `/links <url>` — fetch related articles.\n"
         "• `/chishiki <summary>` — share plain text context and I’ll hunt down coverage.\n"
         "• Reply with `/links` to a link message to avoid retyping.\n"
-        "• DM me a link to get results privately.\n\n"
+        "• DM me a link to get results privately.\n"
+        "• Type `@<bot> <url>` in any chat to share results I already have.\n\n"
         "I only find more links; I do not rate credibility or store full chat histories."
     )
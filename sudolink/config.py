@@ -11,21 +11,74 @@ DEFAULT_USER_AGENT = (
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/125.0.6422.76 Safari/537.36"
 )
+OFFLINE_TELEGRAM_TOKEN = "offline"
 
 
 class Settings(BaseModel):
     telegram_bot_token: str = Field(..., description="Telegram Bot API token")
     openai_api_key: str = Field(..., description="API key for OpenAI responses")
     openai_model: str = Field(default="gpt-4o-mini", description="OpenAI model to use")
+    openai_base_url: str | None = Field(
+        default=None, description="OpenAI-compatible API base URL (None uses the SDK default)"
+    )
+    telegram_base_url: str | None = Field(
+        default=None, description="Bot API base URL, e.g. a local Bot API server"
+    )
+    concurrent_updates: int = Field(
+        default=1, ge=1, description="Updates processed in parallel by python-telegram-bot"
+    )
     max_results: int = Field(default=4, ge=1, le=8)
     insight_limit: int = Field(
         default=3, ge=0, le=6, description="Number of insight bullets to generate"
     )
+    prompt_token_budget: int = Field(
+        default=600, ge=0, description="Approx. article-context tokens sent to OpenAI (0: no trimming)"
+    )
     http_timeout: float = Field(default=12.0, description="Seconds for HTTP calls")
     log_level: str = Field(default="INFO")
     # Some publishers throttle or outright block obviously automated UA strings.
     # Pretend to be a mainstream browser by default so metadata fetches succeed.
     user_agent: str = Field(default=DEFAULT_USER_AGENT)
+    cache_ttl: float = Field(
+        default=3600.0, ge=0, description="Seconds a finished bundle is reused (0 disables)"
+    )
+    cache_size: int = Field(default=512, ge=1, description="Maximum cached bundles")
+    cache_file: str | None = Field(
+        default=None, description="JSONL snapshot loaded on start and saved on shutdown"
+    )
+    metrics_host: str = Field(default="127.0.0.1", description="Bind address for /metrics")
+    metrics_port: int = Field(
+        default=0, ge=0, le=65535, description="Port for the Prometheus endpoint (0 disables)"
+    )
+    log_format: str = Field(default="text", description="'text' or 'json' log lines")
+    admin_user_ids: tuple[int, ...] = Field(
+        default=(), description="Telegram user ids allowed to run /debug"
+    )
+    profile_dir: str = Field(default="profiles", description="Where profiler output is written")
+    slow_callback_ms: float = Field(
+        default=100.0, gt=0, description="Threshold for asyncio slow-callback reports"
+    )
+    journal_path: str | None = Field(
+        default=None, description="SQLite file journaling in-flight requests (None disables)"
+    )
+    shutdown_grace: float = Field(
+        default=20.0, ge=0, description="Seconds to let in-flight requests finish on shutdown"
+    )
+    breaker_failures: int = Field(
+        default=5, ge=1, description="Consecutive failures that open a publisher or OpenAI breaker"
+    )
+    breaker_reset: float = Field(
+        default=30.0, gt=0, description="Seconds an open breaker waits before a probe request"
+    )
+    negative_cache_ttl: float = Field(
+        default=30.0, ge=0, description="Seconds a failed request is answered from memory (0 disables)"
+    )
+    inline_debounce: float = Field(
+        default=0.8, ge=0, description="Typing pause before an inline miss is expanded"
+    )
+    inline_prefetch_limit: int = Field(
+        default=8, ge=1, description="Background expansions for inline queries running at once"
+    )
 
     model_config = {"extra": "ignore"}
 
@@ -42,24 +95,48 @@ class Settings(BaseModel):
         return value.strip()
 
     @classmethod
-    def from_env(cls) -> Settings:
+    def from_env(cls, *, require_telegram: bool = True) -> Settings:
+        telegram_token = _env_first(
+            "SUDOLINK_TELEGRAM_BOT_TOKEN", "TELEGRAM_BOT_TOKEN", default=""
+        )
+        if not require_telegram and not telegram_token:
+            # Offline tools (e.g. `python -m sudolink batch`) never talk to Telegram.
+            telegram_token = OFFLINE_TELEGRAM_TOKEN
         return cls(
-            telegram_bot_token=_env_first(
-                "SUDOLINK_TELEGRAM_BOT_TOKEN", "TELEGRAM_BOT_TOKEN", default=""
-            ),
+            telegram_bot_token=telegram_token,
             openai_api_key=_env_first(
                 "SUDOLINK_OPENAI_API_KEY", "OPENAI_API_KEY", default=""
             ),
             openai_model=os.getenv("SUDOLINK_OPENAI_MODEL", os.getenv("OPENAI_MODEL", "gpt-4o-mini")),
+            openai_base_url=_env_first("SUDOLINK_OPENAI_BASE_URL", "OPENAI_BASE_URL"),
+            telegram_base_url=_env_first("SUDOLINK_TELEGRAM_BASE_URL"),
+            concurrent_updates=int(os.getenv("SUDOLINK_CONCURRENT_UPDATES", "1")),
             max_results=int(os.getenv("SUDOLINK_RESULT_LIMIT", os.getenv("RESULT_LIMIT", "4"))),
             insight_limit=int(
                 os.getenv("SUDOLINK_INSIGHT_LIMIT", os.getenv("INSIGHT_LIMIT", "3"))
             ),
+            prompt_token_budget=int(os.getenv("SUDOLINK_PROMPT_TOKEN_BUDGET", "600")),
             http_timeout=float(
                 os.getenv("SUDOLINK_REQUEST_TIMEOUT", os.getenv("REQUEST_TIMEOUT", "12"))
             ),
             log_level=os.getenv("SUDOLINK_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")),
             user_agent=os.getenv("SUDOLINK_USER_AGENT", os.getenv("USER_AGENT", DEFAULT_USER_AGENT)),
+            cache_ttl=float(os.getenv("SUDOLINK_CACHE_TTL", "3600")),
+            cache_size=int(os.getenv("SUDOLINK_CACHE_SIZE", "512")),
+            cache_file=_env_first("SUDOLINK_CACHE_FILE"),
+            metrics_host=os.getenv("SUDOLINK_METRICS_HOST", "127.0.0.1"),
+            metrics_port=int(os.getenv("SUDOLINK_METRICS_PORT", "0")),
+            log_format=os.getenv("SUDOLINK_LOG_FORMAT", "text").lower(),
+            admin_user_ids=_int_list(os.getenv("SUDOLINK_ADMIN_IDS", "")),
+            profile_dir=os.getenv("SUDOLINK_PROFILE_DIR", "profiles"),
+            slow_callback_ms=float(os.getenv("SUDOLINK_SLOW_CALLBACK_MS", "100")),
+            journal_path=_env_first("SUDOLINK_JOURNAL_PATH"),
+            shutdown_grace=float(os.getenv("SUDOLINK_SHUTDOWN_GRACE", "20")),
+            breaker_failures=int(os.getenv("SUDOLINK_BREAKER_FAILURES", "5")),
+            breaker_reset=float(os.getenv("SUDOLINK_BREAKER_RESET", "30")),
+            negative_cache_ttl=float(os.getenv("SUDOLINK_NEGATIVE_CACHE_TTL", "30")),
+            inline_debounce=float(os.getenv("SUDOLINK_INLINE_DEBOUNCE", "0.8")),
+            inline_prefetch_limit=int(os.getenv("SUDOLINK_INLINE_PREFETCH_LIMIT", "8")),
         )
 
 
@@ -69,3 +146,7 @@ def _env_first(*keys: str, default: str | None = None) -> str | None:
         if value:
             return value
     return default
+
+
+def _int_list(raw: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in raw.replace(" ", "").split(",") if part)
@@ -0,0 +1,132 @@
+"In-memory TTL cache for finished link bundles."
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterator
+
+from sudolink.types import LinkBundle
+
+logger = logging.getLogger(__name__)
+
+
+def url_key(url: str, limit: int) -> str:
+    return f"url|{limit}|{url}"
+
+
+def context_key(context_text: str, limit: int, reference_label: str | None = None) -> str:
+    digest = hashlib.sha1(
+        f"{reference_label or ''}\n{context_text.strip()}".encode("utf-8")
+    ).hexdigest()
+    return f"context|{limit}|{digest}"
+
+
+class BundleCache:
+    """LRU cache of `LinkBundle`s keyed by `url_key`/`context_key`.
+
+    Expiry uses wall-clock time so a snapshot written by one process (for
+    example `python -m sudolink batch`) stays meaningful when loaded by another.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, LinkBundle]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, key: str) -> LinkBundle | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, bundle = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return bundle
+
+    def put(self, key: str, bundle: LinkBundle) -> None:
+        if self._ttl <= 0:
+            return
+        self._store(key, self._clock() + self._ttl, bundle)
+
+    def dump(self, path: str | Path) -> int:
+        """Merge unexpired entries into the JSONL snapshot at `path`; returns the count written.
+
+        Entries already in the file (say, written by a batch run while the bot
+        was up) are kept; for keys present in both, the later expiry wins. The
+        newest `max_entries` by expiry are written.
+        """
+
+        now = self._clock()
+        target = Path(path)
+        merged: dict[str, tuple[float, LinkBundle]] = {}
+        for key, expires_at, bundle in self._read(target):
+            if expires_at > now:
+                merged[key] = (expires_at, bundle)
+        for key, (expires_at, bundle) in self._entries.items():
+            if expires_at > now and expires_at >= merged.get(key, (0.0, None))[0]:
+                merged[key] = (expires_at, bundle)
+        keep = sorted(merged.items(), key=lambda item: item[1][0])[-self._max_entries:]
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            for key, (expires_at, bundle) in keep:
+                record = {"key": key, "expires_at": expires_at, "bundle": bundle.as_dict()}
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        tmp.replace(target)
+        return len(keep)
+
+    def load(self, path: str | Path) -> int:
+        """Merge a snapshot written by `dump`; returns the number of entries kept."""
+
+        now = self._clock()
+        loaded = 0
+        for key, expires_at, bundle in self._read(Path(path)):
+            if expires_at <= now:
+                continue
+            self._store(key, expires_at, bundle)
+            loaded += 1
+        return loaded
+
+    @staticmethod
+    def _read(source: Path) -> Iterator[tuple[str, float, LinkBundle]]:
+        if not source.exists():
+            return
+        with source.open(encoding="utf-8") as handle:
+            for line_no, raw in enumerate(handle, start=1):
+                if not raw.strip():
+                    continue
+                try:
+                    record = json.loads(raw)
+                    expires_at = float(record["expires_at"])
+                    bundle = LinkBundle.from_dict(record["bundle"])
+                    key = str(record["key"])
+                except (ValueError, KeyError, TypeError) as exc:
+                    logger.warning("Skipping bad cache record %s:%d: %s", source, line_no, exc)
+                    continue
+                yield key, expires_at, bundle
+
+    def _store(self, key: str, expires_at: float, bundle: LinkBundle) -> None:
+        self._entries[key] = (expires_at, bundle)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,212 @@
+"""Circuit breakers and a short-lived failure cache for upstream dependencies.
+
+A breaker opens after `failure_threshold` consecutive failures and then
+rejects calls without touching the dependency for `reset_timeout` seconds.
+After that it is half-open: exactly one probe call goes through, and its
+outcome closes the breaker or re-opens it for another `reset_timeout`.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sudolink.metrics import BREAKER_STATE
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """The breaker rejected the call; callers translate this into their own error."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} is unavailable; retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        export_closed: bool = True,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        # Per-host breakers only show up in metrics while they are unhealthy.
+        self._export_closed = export_closed
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        if export_closed:
+            self._export()
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        if self._state == CLOSED:
+            return 0.0
+        if self._state == HALF_OPEN:
+            return 1.0  # a probe is already in flight
+        return max(1.0, self._opened_at + self._reset_timeout - self._clock())
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[Exception], bool] = lambda exc: True) -> Iterator[None]:
+        """Run the body under the breaker or raise `CircuitOpenError` straight away.
+
+        Exceptions for which `is_failure` returns False (say, a 404 from a host
+        that is otherwise healthy) count as successes; cancellation counts as
+        neither.
+        """
+
+        if not self._acquire():
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            yield
+        except Exception as exc:
+            if is_failure(exc):
+                self._record_failure()
+            else:
+                self._record_success()
+            raise
+        except BaseException:
+            self._probing = False
+            raise
+        else:
+            self._record_success()
+
+    def _acquire(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            self._set_state(HALF_OPEN)
+            return True
+        return False
+
+    def _record_success(self) -> None:
+        self._probing = False
+        self._failures = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def _record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+            self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        if self._export_closed:
+            return
+        if state == CLOSED:
+            BREAKER_STATE.remove(self.name)
+        else:
+            self._export()
+
+    def _export(self) -> None:
+        # Read `state` at scrape time so open -> half-open shows up without a probe call.
+        BREAKER_STATE.set_function(lambda: _STATE_VALUES[self.state], self.name)
+
+
+class BreakerGroup:
+    """Breakers created on demand per key (e.g. per host), bounded by LRU."""
+
+    def __init__(
+        self,
+        prefix: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_breakers: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._prefix = prefix
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_breakers = max(1, max_breakers)
+        self._clock = clock
+        self._breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+
+    def get(self, key: str) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(
+                f"{self._prefix}:{key}",
+                failure_threshold=self._failure_threshold,
+                reset_timeout=self._reset_timeout,
+                clock=self._clock,
+                export_closed=False,
+            )
+            self._evict()
+        else:
+            self._breakers.move_to_end(key)
+        return breaker
+
+    def unhealthy(self) -> dict[str, str]:
+        return {
+            breaker.name: state
+            for breaker in self._breakers.values()
+            if (state := breaker.state) != CLOSED
+        }
+
+    def _evict(self) -> None:
+        while len(self._breakers) > self._max_breakers:
+            _, breaker = self._breakers.popitem(last=False)
+            BREAKER_STATE.remove(breaker.name)
+
+
+class FailureCache:
+    """Remembers recent failures per key for `ttl` seconds so repeats fail fast."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 30.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Exception]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Exception | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, error = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        return error
+
+    def put(self, key: str, error: Exception) -> None:
+        if self._ttl <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (self._clock() + self._ttl, error)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
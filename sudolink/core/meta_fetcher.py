@@ -4,11 +4,14 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from typing import Sequence
+from urllib.parse import urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 
+from sudolink.core.circuit_breaker import BreakerGroup, CircuitOpenError
 from sudolink.exceptions import MetadataFetchError
+from sudolink.metrics import FETCH_BYTES, record_error, track_stage
 from sudolink.types import MetaInfo
 
 
@@ -19,33 +22,64 @@ class MetaFetcher:
         *,
         user_agent: str,
         timeout: float,
+        breakers: BreakerGroup | None = None,
     ) -> None:
         self._client = client
         self._timeout = timeout
         self._headers = {"User-Agent": user_agent}
+        self._breakers = breakers or BreakerGroup("host")
+
+    @property
+    def breakers(self) -> BreakerGroup:
+        return self._breakers
 
     async def fetch(self, url: str) -> MetaInfo:
+        breaker = self._breakers.get(urlparse(url).netloc.lower())
         try:
-            response = await self._client.get(
-                url, headers=self._headers, follow_redirects=True, timeout=self._timeout
-            )
-            response.raise_for_status()
+            with breaker.guard(_is_host_failure), track_stage("fetch"):
+                response = await self._client.get(
+                    url, headers=self._headers, follow_redirects=True, timeout=self._timeout
+                )
+                response.raise_for_status()
+        except CircuitOpenError as exc:
+            record_error("meta_fetcher", exc)
+            raise MetadataFetchError(
+                f"Unable to fetch the original link: {urlparse(url).netloc} keeps failing, "
+                f"so it is skipped for the next {exc.retry_after:.0f}s."
+            ) from exc
         except (httpx.HTTPError, httpx.RequestError) as exc:
+            record_error("meta_fetcher", exc)
             raise MetadataFetchError(f"Unable to fetch the original link: {exc}") from exc
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        title = _pick_first(
-            soup.title.string.strip() if soup.title and soup.title.string else "",
-            _meta(soup, "og:title"),
-            _meta(soup, "twitter:title"),
-        )
-        description = _pick_first(
-            _meta(soup, "description"),
-            _meta(soup, "og:description"),
-            _meta(soup, "twitter:description"),
-        )
-        keywords = tuple(_collect_keywords(soup))
-        return MetaInfo(url=url, title=title or None, description=description, keywords=keywords)
+        FETCH_BYTES.observe(len(response.content))
+        with track_stage("parse"):
+            return parse_metadata(url, response.text)
+
+
+def _is_host_failure(exc: Exception) -> bool:
+    # A 404 for one article says nothing about the host; timeouts, 5xx and blocks do.
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status in (403, 429)
+    return isinstance(exc, httpx.TransportError)
+
+
+def parse_metadata(url: str, html: str) -> MetaInfo:
+    """Extract title/description/keywords from an article page."""
+
+    soup = BeautifulSoup(html, "html.parser")
+    title = _pick_first(
+        soup.title.string.strip() if soup.title and soup.title.string else "",
+        _meta(soup, "og:title"),
+        _meta(soup, "twitter:title"),
+    )
+    description = _pick_first(
+        _meta(soup, "description"),
+        _meta(soup, "og:description"),
+        _meta(soup, "twitter:description"),
+    )
+    keywords = tuple(_collect_keywords(soup))
+    return MetaInfo(url=url, title=title or None, description=description, keywords=keywords)
 
 
 def _meta(soup: BeautifulSoup, name: str) -> str:
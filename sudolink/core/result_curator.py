@@ -5,6 +5,7 @@ from __future__ import annotations
 from collections import Counter
 from urllib.parse import urlparse
 
+from sudolink.metrics import track_stage
 from sudolink.types import SearchResult
 
 
@@ -15,6 +16,10 @@ class ResultCurator:
     def curate(self, results: list[SearchResult], limit: int) -> list[SearchResult]:
         if not results:
             return []
+        with track_stage("curate"):
+            return self._curate(results, limit)
+
+    def _curate(self, results: list[SearchResult], limit: int) -> list[SearchResult]:
         seen: set[str] = set()
         domain_counts: Counter[str] = Counter()
         preferred: list[SearchResult] = []
@@ -0,0 +1,352 @@
+"""Lightweight in-process metrics with a Prometheus text endpoint.
+
+Counters, gauges and histograms are plain Python objects updated from the
+event loop thread; recording a value is a dict lookup plus an addition, so the
+hot path stays cheap. `MetricsServer` renders the registry in the Prometheus
+text exposition format on ``GET /metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Sequence
+
+from sudolink.tracing import current_trace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        registry: Registry | None = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        self._children.pop(values, None)
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def _label_str(self, values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _FunctionValue:
+    __slots__ = ("_fn",)
+
+    def __init__(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    @property
+    def value(self) -> float:
+        return self._fn()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{self._label_str(values)} {_fmt(child.value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set_function(self, fn: Callable[[], float], *values: str) -> None:
+        """Report `fn()` for these labels, evaluated whenever the metric is rendered."""
+
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        self._children[values] = _FunctionValue(fn)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_child", "_started")
+
+    def __init__(self, child: _HistogramChild) -> None:
+        self._child = child
+        self._started = 0.0
+
+    def __enter__(self) -> _Timer:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._child.observe(time.perf_counter() - self._started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Registry | None = REGISTRY,
+    ) -> None:
+        self._bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        super().__init__(name, documentation, labelnames, registry=registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self._bounds, child.counts):
+                cumulative += count
+                le = f'le="{_fmt(bound)}"'
+                yield f"{self.name}_bucket{self._label_str(values, le)} {cumulative}"
+            yield f"{self.name}_bucket{self._label_str(values, _INF_LABEL)} {child.count}"
+            yield f"{self.name}_sum{self._label_str(values)} {_fmt(child.sum)}"
+            yield f"{self.name}_count{self._label_str(values)} {child.count}"
+
+
+_INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+# Pipeline metrics --------------------------------------------------------
+
+STAGE_SECONDS = Histogram(
+    "sudolink_stage_seconds",
+    "Wall time spent in each pipeline stage.",
+    ["stage"],
+)
+REQUESTS_TOTAL = Counter(
+    "sudolink_requests_total",
+    "Handled bot requests by command and outcome.",
+    ["command", "outcome"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "sudolink_requests_in_flight",
+    "Requests currently being processed.",
+    ["command"],
+)
+ERRORS_TOTAL = Counter(
+    "sudolink_errors_total",
+    "Errors raised by pipeline components, by exception class.",
+    ["component", "error"],
+)
+CACHE_LOOKUPS_TOTAL = Counter(
+    "sudolink_cache_lookups_total",
+    "Bundle cache lookups by result.",
+    ["result"],
+)
+FETCH_BYTES = Histogram(
+    "sudolink_fetch_bytes",
+    "Size of downloaded article bodies.",
+    buckets=(1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6),
+)
+OPENAI_TOKENS_TOTAL = Counter(
+    "sudolink_openai_tokens_total",
+    "OpenAI token usage reported by the API (prompt, completion, cached prompt).",
+    ["model", "kind"],
+)
+PROMPT_TOKENS_SAVED_TOTAL = Counter(
+    "sudolink_prompt_tokens_saved_total",
+    "Estimated prompt tokens removed by context compaction.",
+)
+BREAKER_STATE = Gauge(
+    "sudolink_circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open); per-host breakers only while unhealthy.",
+    ["breaker"],
+)
+
+
+class _StageTimer(_Timer):
+    __slots__ = ("_stage",)
+
+    def __init__(self, child: _HistogramChild, stage: str) -> None:
+        super().__init__(child)
+        self._stage = stage
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._started
+        self._child.observe(elapsed)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_stage(self._stage, elapsed)
+
+
+def track_stage(stage: str) -> _Timer:
+    """Time a block into `sudolink_stage_seconds{stage=...}` and the active trace."""
+
+    return _StageTimer(STAGE_SECONDS.labels(stage), stage)
+
+
+def record_error(component: str, exc: BaseException) -> None:
+    ERRORS_TOTAL.labels(component, type(exc).__name__).inc()
+
+
+class MetricsServer:
+    """Minimal asyncio HTTP server exposing `registry` on ``/metrics``."""
+
+    def __init__(self, *, host: str, port: int, registry: Registry = REGISTRY) -> None:
+        self._host = host
+        self._port = port
+        self._registry = registry
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def port(self) -> int:
+        if self._server and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self._host, self._port)
+        logger.info("Metrics endpoint listening on http://%s:%d/metrics", self._host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            while True:
+                header = await asyncio.wait_for(reader.readline(), timeout=5)
+                if header in (b"\r\n", b"\n", b""):
+                    break
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+            if len(parts) >= 2 and parts[0] == "GET" and path in ("/metrics", "/"):
+                status, body = "200 OK", self._registry.render().encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                status, body, content_type = "404 Not Found", b"not found\n", "text/plain"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
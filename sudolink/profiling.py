@@ -0,0 +1,231 @@
+"""Runtime profiling controls for a live bot.
+
+Everything here is off by default and costs nothing until switched on, either
+from the admin-only `/debug` command or by signal (SIGUSR1 toggles the CPU
+profiler, SIGUSR2 toggles memory tracing). Results are written as files under
+the configured profile directory:
+
+* ``cpu-<timestamp>.folded`` – sampled stacks in the folded format understood
+  by flamegraph.pl / speedscope.
+* ``slow-callbacks-<timestamp>.log`` – asyncio callbacks that blocked the loop
+  longer than the threshold.
+* ``mem-<timestamp>.txt`` – top allocation sites from a tracemalloc snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y%m%d-%H%M%S")
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread."""
+
+    def __init__(self, *, interval: float = 0.005, max_depth: int = 64) -> None:
+        self._interval = interval
+        self._max_depth = max_depth
+        self._stacks: Counter[str] = Counter()
+        self._samples = 0
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._target_id = threading.main_thread().ident
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, target_thread_id: int | None = None) -> None:
+        if self._thread is not None:
+            return
+        self._target_id = target_thread_id or threading.get_ident()
+        self._stacks.clear()
+        self._samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sudolink-cpu-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, output: Path) -> int:
+        """Stop sampling, write folded stacks to `output` and return the sample count."""
+
+        if self._thread is None:
+            return 0
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            for stack, count in self._stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+        return self._samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            self._stacks[self._fold(frame)] += 1
+            self._samples += 1
+
+    def _fold(self, frame: FrameType | None) -> str:
+        parts: list[str] = []
+        while frame is not None and len(parts) < self._max_depth:
+            code = frame.f_code
+            parts.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+            frame = frame.f_back
+        parts.reverse()
+        return ";".join(parts)
+
+
+class Profiler:
+    """Bundles the CPU sampler, slow-callback detection and tracemalloc."""
+
+    def __init__(
+        self,
+        *,
+        output_dir: str | Path,
+        slow_callback_ms: float = 100.0,
+        top_allocations: int = 25,
+    ) -> None:
+        self._output_dir = Path(output_dir)
+        self._slow_callback_ms = slow_callback_ms
+        self._top_allocations = top_allocations
+        self._cpu = SamplingProfiler()
+        self._slow_handler: logging.FileHandler | None = None
+        self._slow_previous: tuple[bool, float] | None = None
+
+    def install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for name, callback in (("SIGUSR1", self.toggle_cpu), ("SIGUSR2", self.toggle_memory)):
+            sig = getattr(signal, name, None)
+            if sig is None:
+                continue
+            try:
+                loop.add_signal_handler(sig, self._log_result, callback)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    def _log_result(self, callback) -> None:
+        logger.warning("Profiler: %s", callback())
+
+    def status(self) -> str:
+        cpu = "on" if self._cpu.running else "off"
+        slow = f"on (>{self._slow_callback_ms:.0f} ms)" if self._slow_handler else "off"
+        memory = "on" if tracemalloc.is_tracing() else "off"
+        return f"cpu={cpu}, slow_callbacks={slow}, tracemalloc={memory}, output={self._output_dir}"
+
+    # CPU --------------------------------------------------------------------
+
+    def start_cpu(self) -> str:
+        if self._cpu.running:
+            return "CPU profiler already running."
+        self._cpu.start()
+        return "CPU profiler started."
+
+    def stop_cpu(self) -> str:
+        if not self._cpu.running:
+            return "CPU profiler is not running."
+        path = self._output_dir / f"cpu-{_timestamp()}.folded"
+        samples = self._cpu.stop(path)
+        return f"CPU profile with {samples} samples written to {path}."
+
+    def toggle_cpu(self) -> str:
+        return self.stop_cpu() if self._cpu.running else self.start_cpu()
+
+    # Slow callbacks --------------------------------------------------------
+
+    def start_slow_callbacks(self, threshold_ms: float | None = None) -> str:
+        loop = asyncio.get_running_loop()
+        if threshold_ms is not None:
+            self._slow_callback_ms = threshold_ms
+        if self._slow_handler is None:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            path = self._output_dir / f"slow-callbacks-{_timestamp()}.log"
+            handler = logging.FileHandler(path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            handler.setLevel(logging.WARNING)
+            logging.getLogger("asyncio").addHandler(handler)
+            self._slow_handler = handler
+            self._slow_previous = (loop.get_debug(), loop.slow_callback_duration)
+        # asyncio's debug mode is what reports "Executing <Handle ...> took X seconds".
+        loop.slow_callback_duration = self._slow_callback_ms / 1000
+        loop.set_debug(True)
+        return f"Slow-callback detection on (>{self._slow_callback_ms:.0f} ms)."
+
+    def stop_slow_callbacks(self) -> str:
+        if self._slow_handler is None:
+            return "Slow-callback detection is not running."
+        loop = asyncio.get_running_loop()
+        if self._slow_previous is not None:
+            debug, duration = self._slow_previous
+            loop.set_debug(debug)
+            loop.slow_callback_duration = duration
+        logging.getLogger("asyncio").removeHandler(self._slow_handler)
+        self._slow_handler.close()
+        path = self._slow_handler.baseFilename
+        self._slow_handler = None
+        self._slow_previous = None
+        return f"Slow-callback detection off; log at {path}."
+
+    # Memory ----------------------------------------------------------------
+
+    def start_memory(self, frames: int = 10) -> str:
+        if tracemalloc.is_tracing():
+            return "tracemalloc already running."
+        tracemalloc.start(frames)
+        return "tracemalloc started."
+
+    def snapshot_memory(self) -> str:
+        if not tracemalloc.is_tracing():
+            return "tracemalloc is not running."
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        path = self._output_dir / f"mem-{_timestamp()}.txt"
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write(f"traced current={current} B peak={peak} B\n\n")
+            for stat in snapshot.statistics("traceback")[: self._top_allocations]:
+                handle.write(f"{stat.size} B in {stat.count} blocks\n")
+                for line in stat.traceback.format():
+                    handle.write(f"{line}\n")
+                handle.write("\n")
+        return f"Top {self._top_allocations} allocators written to {path}."
+
+    def stop_memory(self) -> str:
+        if not tracemalloc.is_tracing():
+            return "tracemalloc is not running."
+        result = self.snapshot_memory()
+        tracemalloc.stop()
+        return result
+
+    def toggle_memory(self) -> str:
+        return self.stop_memory() if tracemalloc.is_tracing() else self.start_memory()
+
+    def shutdown(self) -> None:
+        for running, stop in (
+            (self._cpu.running, self.stop_cpu),
+            (self._slow_handler is not None, self.stop_slow_callbacks),
+            (tracemalloc.is_tracing(), self.stop_memory),
+        ):
+            if running:
+                logger.info("Profiler: %s", stop())
@@ -3,77 +3,263 @@
 from __future__ import annotations
 
 import json
+import re
+from collections import OrderedDict
 from typing import Sequence
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, BadRequestError
 
+from sudolink.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from sudolink.exceptions import SearchProviderError
+from sudolink.metrics import (
+    ERRORS_TOTAL,
+    OPENAI_TOKENS_TOTAL,
+    PROMPT_TOKENS_SAVED_TOTAL,
+    record_error,
+    track_stage,
+)
+from sudolink.tracing import current_trace
 from sudolink.types import MetaInfo, SearchResult
 
+# Rough English average for OpenAI tokenizers; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+# Typical completion cost per requested item in the JSON the prompt asks for.
+# max_tokens is a runaway guard, not a target, so it gets generous headroom on top.
+LINK_COMPLETION_TOKENS = 120
+INSIGHT_COMPLETION_TOKENS = 60
+COMPLETION_HEADROOM = 1.5
+RESPONSE_OVERHEAD_TOKENS = 200
+MAX_TITLE_TOKENS = 60
+MAX_KEYWORDS = 12
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact_context(
+    title: str, description: str, keywords: Sequence[str], *, budget: int
+) -> tuple[str, str, list[str]]:
+    """Trim and deduplicate the article context to roughly `budget` tokens.
+
+    Whitespace is collapsed, keywords repeating each other or the title are
+    dropped, repeated description sentences are removed, and the description
+    is cut at a sentence (or word) boundary once the budget runs out. A budget
+    of 0 only normalises whitespace.
+    """
+
+    title = _squash(title)
+    if budget:
+        title = _truncate(title, MAX_TITLE_TOKENS * CHARS_PER_TOKEN)
+    folded_title = title.casefold()
+    unique: OrderedDict[str, str] = OrderedDict()
+    for keyword in keywords:
+        cleaned = _squash(keyword)
+        folded = cleaned.casefold()
+        if not cleaned or folded in unique:
+            continue
+        if budget and _contains_phrase(folded_title, folded):
+            continue
+        unique[folded] = cleaned
+    kept_keywords = list(unique.values())
+    description = _squash(description)
+    if not budget:
+        return title, description, kept_keywords
+
+    kept_keywords = kept_keywords[:MAX_KEYWORDS]
+    while kept_keywords and estimate_tokens(", ".join(kept_keywords)) > budget // 4:
+        kept_keywords.pop()
+
+    sentences: list[str] = []
+    seen: set[str] = {folded_title.rstrip(".!? ")}
+    for sentence in _SENTENCE_RE.split(description):
+        folded = sentence.casefold().rstrip(".!? ")
+        if sentence and folded not in seen:
+            seen.add(folded)
+            sentences.append(sentence)
+    remaining = budget - estimate_tokens(title) - estimate_tokens(", ".join(kept_keywords))
+    remaining = max(remaining, budget // 2)
+    kept: list[str] = []
+    used = 0
+    for sentence in sentences:
+        cost = estimate_tokens(sentence) + 1
+        if used + cost > remaining:
+            if not kept:
+                kept.append(_truncate(sentence, remaining * CHARS_PER_TOKEN))
+            break
+        kept.append(sentence)
+        used += cost
+    return title, " ".join(kept), kept_keywords
+
+
+def _is_outage(exc: Exception) -> bool:
+    # A rejected prompt is our problem, not an OpenAI outage.
+    return not isinstance(exc, BadRequestError)
+
+
+def _contains_phrase(text: str, phrase: str) -> bool:
+    # Whole words only: "US" must not match inside "Business".
+    return re.search(rf"(?<!\w){re.escape(phrase)}(?!\w)", text) is not None
+
+
+def _squash(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max(0, max_chars - 1)].rsplit(" ", 1)[0]
+    return cut.rstrip(",;:- ") + "…"
+
 
 class AIExpansionService:
+    """Asks OpenAI for related coverage and insights about one article.
+
+    The prompt is laid out as a stable prefix (system prompt, then the task
+    instructions) followed by the per-article context, so provider-side prompt
+    caching can reuse the prefix across requests once it grows long enough.
+    """
+
     def __init__(
         self,
         *,
         client: AsyncOpenAI,
         model: str,
         insight_limit: int,
+        prompt_token_budget: int = 600,
+        breaker: CircuitBreaker | None = None,
     ) -> None:
         self._client = client
         self._model = model
         self._insight_limit = max(0, insight_limit)
+        self._prompt_token_budget = max(0, prompt_token_budget)
+        self._system_prompt = self._build_system_prompt()
+        self._instructions: dict[int, str] = {}
+        self._breaker = breaker or CircuitBreaker("openai")
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    def max_tokens_for(self, limit: int) -> int:
+        expected = (
+            max(0, limit) * LINK_COMPLETION_TOKENS
+            + self._insight_limit * INSIGHT_COMPLETION_TOKENS
+        )
+        return int(expected * COMPLETION_HEADROOM) + RESPONSE_OVERHEAD_TOKENS
 
     async def expand(self, meta: MetaInfo, *, limit: int) -> tuple[list[SearchResult], list[str]]:
         messages = self._build_messages(meta, limit)
         try:
-            response = await self._client.chat.completions.create(
-                model=self._model,
-                temperature=0.2,
-                response_format={"type": "json_object"},
-                messages=messages,
-            )
+            with self._breaker.guard(_is_outage), track_stage("openai"):
+                response = await self._client.chat.completions.create(
+                    model=self._model,
+                    temperature=0.2,
+                    response_format={"type": "json_object"},
+                    messages=messages,
+                    max_tokens=self.max_tokens_for(limit),
+                )
+        except CircuitOpenError as exc:
+            record_error("openai", exc)
+            raise SearchProviderError(
+                "OpenAI is failing right now; try again in about "
+                f"{exc.retry_after:.0f} seconds."
+            ) from exc
         except Exception as exc:  # pragma: no cover - network failure path
+            record_error("openai", exc)
             raise SearchProviderError(f"OpenAI request failed: {exc}") from exc
+        self._record_usage(response)
 
-        content = (
-            response.choices[0].message.content if response.choices else None
-        )
+        choice = response.choices[0] if response.choices else None
+        content = choice.message.content if choice else None
         if not content:
+            ERRORS_TOTAL.labels("openai", "EmptyResponse").inc()
             raise SearchProviderError("OpenAI response did not include any content.")
-        try:
-            payload = json.loads(content)
-        except json.JSONDecodeError as exc:  # pragma: no cover - model misbehaviour
-            raise SearchProviderError("OpenAI response was not valid JSON.") from exc
+        truncated = choice.finish_reason == "length"
+        if truncated:
+            ERRORS_TOTAL.labels("openai", "Truncated").inc()
+        with track_stage("openai_parse"):
+            try:
+                payload = json.loads(content)
+            except json.JSONDecodeError as exc:  # pragma: no cover - model misbehaviour
+                record_error("openai", exc)
+                if truncated:
+                    raise SearchProviderError(
+                        "OpenAI response was cut off before it finished."
+                    ) from exc
+                raise SearchProviderError("OpenAI response was not valid JSON.") from exc
 
-        related = self._parse_links(payload.get("related_links"), limit)
-        insights = self._parse_insights(payload.get("insights"))
+            related = self._parse_links(payload.get("related_links"), limit)
+            insights = self._parse_insights(payload.get("insights"))
         return related, insights
 
-    def _build_messages(self, meta: MetaInfo, limit: int) -> list[dict[str, str]]:
-        keywords = ", ".join(meta.keywords) if meta.keywords else "n/a"
-        description = meta.description or "n/a"
-        title = meta.title or "Untitled"
-        system_prompt = (
+    def _record_usage(self, response: object) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        counts = {
+            "prompt": getattr(usage, "prompt_tokens", None) or 0,
+            "completion": getattr(usage, "completion_tokens", None) or 0,
+            "cached": getattr(details, "cached_tokens", None) or 0,
+        }
+        for kind, value in counts.items():
+            if value:
+                OPENAI_TOKENS_TOTAL.labels(self._model, kind).inc(value)
+        trace = current_trace()
+        if trace is not None:
+            trace.fields.update({f"{kind}_tokens": value for kind, value in counts.items()})
+
+    def _build_system_prompt(self) -> str:
+        return (
             "You are SudoLink, an assistant that widens a reader's perspective by "
             "finding reputable coverage of the same news story. Always respond with "
             "valid JSON containing two keys: 'related_links' and 'insights'. "
             "'related_links' must be an array of objects with fields "
             "title, url, source, and summary. 'insights' must be an array of short "
-            "bullets highlighting angles, implications, or tensions between outlets."
+            "bullets highlighting angles, implications, or tensions between outlets. "
+            "Keep each summary to one or two sentences."
+        )
+
+    def _instructions_for(self, limit: int) -> str:
+        cached = self._instructions.get(limit)
+        if cached is None:
+            cached = self._instructions[limit] = (
+                f"Return up to {limit} distinct news links from established outlets that "
+                "cover the same event as the article below. Explain why each linked article "
+                "matters in the 'summary' field and avoid speculation or invented outlets. "
+                f"Also provide up to {self._insight_limit} concise insights about how the "
+                "coverage differs, why it matters, or what readers should watch next."
+            )
+        return cached
+
+    def _build_messages(self, meta: MetaInfo, limit: int) -> list[dict[str, str]]:
+        raw_title = meta.title or "Untitled"
+        raw_description = meta.description or ""
+        title, description, keywords = compact_context(
+            raw_title, raw_description, meta.keywords, budget=self._prompt_token_budget
+        )
+        saved = estimate_tokens(raw_title + raw_description + ", ".join(meta.keywords)) - (
+            estimate_tokens(title + description + ", ".join(keywords))
         )
+        if saved > 0:
+            PROMPT_TOKENS_SAVED_TOTAL.inc(saved)
+            trace = current_trace()
+            if trace is not None:
+                trace.fields["prompt_tokens_saved"] = saved
         user_prompt = (
+            f"{self._instructions_for(limit)}\n\n"
             f"Original article URL: {meta.url}\n"
-            f"Title: {title}\n"
-            f"Description: {description}\n"
-            f"Keywords: {keywords}\n\n"
-            f"Return up to {limit} distinct news links from established outlets that "
-            "cover the same event. Explain why each linked article matters in the "
-            "'summary' field and avoid speculation or invented outlets. "
-            f"Also provide up to {self._insight_limit} concise insights about how the "
-            "coverage differs, why it matters, or what readers should watch next."
+            f"Title: {title or 'Untitled'}\n"
+            f"Description: {description or 'n/a'}\n"
+            f"Keywords: {', '.join(keywords) if keywords else 'n/a'}"
         )
         return [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": self._system_prompt},
             {"role": "user", "content": user_prompt},
         ]
 
@@ -0,0 +1,50 @@
+"Wire the link pipeline from settings."
+
+from __future__ import annotations
+
+import httpx
+from openai import AsyncOpenAI
+
+from sudolink.config import Settings
+from sudolink.core.bundle_cache import BundleCache
+from sudolink.core.circuit_breaker import BreakerGroup, CircuitBreaker, FailureCache
+from sudolink.core.meta_fetcher import MetaFetcher
+from sudolink.core.result_curator import ResultCurator
+from sudolink.services.ai_expansion import AIExpansionService
+from sudolink.services.link_service import LinkService
+
+
+def build_link_service(settings: Settings, http_client: httpx.AsyncClient) -> LinkService:
+    meta_fetcher = MetaFetcher(
+        client=http_client,
+        user_agent=settings.user_agent,
+        timeout=settings.http_timeout,
+        breakers=BreakerGroup(
+            "host",
+            failure_threshold=settings.breaker_failures,
+            reset_timeout=settings.breaker_reset,
+        ),
+    )
+    curator = ResultCurator()
+    openai_client = AsyncOpenAI(
+        api_key=settings.openai_api_key, base_url=settings.openai_base_url
+    )
+    ai_service = AIExpansionService(
+        client=openai_client,
+        model=settings.openai_model,
+        insight_limit=settings.insight_limit,
+        prompt_token_budget=settings.prompt_token_budget,
+        breaker=CircuitBreaker(
+            "openai",
+            failure_threshold=settings.breaker_failures,
+            reset_timeout=settings.breaker_reset,
+        ),
+    )
+    cache = BundleCache(max_entries=settings.cache_size, ttl=settings.cache_ttl)
+    return LinkService(
+        meta_fetcher=meta_fetcher,
+        ai_service=ai_service,
+        result_curator=curator,
+        cache=cache,
+        failures=FailureCache(ttl=settings.negative_cache_ttl),
+    )
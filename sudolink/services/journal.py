@@ -0,0 +1,262 @@
+"""SQLite journal of accepted requests so restarts do not drop replies.
+
+Handlers `accept()` a request before running the pipeline and execute the
+pipeline-plus-reply coroutine through `run()`, which deletes the entry once it
+completes. Writes are buffered and committed in batches from a worker thread;
+a request that completes within one flush interval never touches the disk.
+Finished rows are deleted rather than kept, so the journal only ever holds
+in-flight payloads.
+
+On startup `unfinished()` returns whatever a previous process accepted but
+never answered; on shutdown `drain()` waits for in-flight handlers up to a
+grace period and cancels the rest, leaving them journaled for the next start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    chat_id INTEGER NOT NULL,
+    message_id INTEGER,
+    payload TEXT NOT NULL,
+    label TEXT,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class RequestDeferred(Exception):
+    """The request was cancelled during shutdown and stays journaled for replay."""
+
+
+@dataclass(slots=True)
+class JournalEntry:
+    entry_id: str
+    kind: str
+    chat_id: int
+    message_id: int | None
+    payload: str
+    label: str | None = None
+    attempts: int = 0
+
+
+class RequestJournal:
+    def __init__(
+        self,
+        path: str | Path | None,
+        *,
+        flush_interval: float = 0.25,
+        max_attempts: int = 3,
+    ) -> None:
+        self._path = Path(path) if path else None
+        self._flush_interval = flush_interval
+        self._max_attempts = max_attempts
+        self._conn: sqlite3.Connection | None = None
+        self._write_lock = threading.Lock()
+        self._pending_inserts: dict[str, tuple[object, ...]] = {}
+        self._pending_deletes: list[str] = []
+        self._wake = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+        self._in_flight: dict[str, asyncio.Future | None] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closing = False
+
+    async def open(self) -> None:
+        if self._path is not None:
+            self._conn = await asyncio.to_thread(self._connect, self._path)
+        self._flusher = asyncio.create_task(self._flush_loop(), name="sudolink-journal-flush")
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def accept(
+        self,
+        *,
+        kind: str,
+        chat_id: int,
+        message_id: int | None,
+        payload: str,
+        label: str | None = None,
+    ) -> str:
+        """Record a request about to be processed; returns its journal id."""
+
+        entry_id = uuid.uuid4().hex
+        if self._conn is not None:
+            self._pending_inserts[entry_id] = (
+                entry_id, kind, chat_id, message_id, payload, label, "accepted", 0, time.time()
+            )
+            self._wake.set()
+        self._track(entry_id)
+        return entry_id
+
+    def track(self, entry: JournalEntry) -> None:
+        """Mark an already-persisted entry (about to be replayed) as in flight."""
+
+        self._track(entry.entry_id)
+
+    async def run(self, entry_id: str, work: Awaitable[T]) -> T:
+        """Await `work` for an accepted entry and drop the entry once it completes.
+
+        Raises `RequestDeferred` when `drain()` cancelled the work; the entry
+        then stays journaled. Failures other than that still complete the entry
+        so a poisoned request is not replayed forever.
+        """
+
+        if self._closing:
+            # Accepted after the grace period ran out: keep it for the next process.
+            if asyncio.iscoroutine(work):
+                work.close()
+            self._release(entry_id, completed=False)
+            raise RequestDeferred(entry_id)
+        task = asyncio.ensure_future(work)
+        self._in_flight[entry_id] = task
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            self._release(entry_id, completed=False)
+            raise
+        if task.cancelled():
+            self._release(entry_id, completed=False)
+            raise RequestDeferred(entry_id)
+        self._release(entry_id, completed=True)
+        return task.result()
+
+    async def unfinished(self) -> list[JournalEntry]:
+        """Entries left by a previous run; each call counts as one replay attempt."""
+
+        if self._conn is None:
+            return []
+        rows = await asyncio.to_thread(self._claim_unfinished)
+        return [JournalEntry(*row) for row in rows]
+
+    def _claim_unfinished(self) -> list[tuple]:
+        assert self._conn is not None
+        with self._write_lock, self._conn:
+            self._conn.execute("BEGIN")
+            dropped = self._conn.execute(
+                "DELETE FROM requests WHERE attempts >= ?", (self._max_attempts,)
+            ).rowcount
+            if dropped:
+                logger.warning(
+                    "Dropped %d journaled requests after %d attempts", dropped, self._max_attempts
+                )
+            self._conn.execute("UPDATE requests SET attempts = attempts + 1, state = 'replaying'")
+            return self._conn.execute(
+                "SELECT id, kind, chat_id, message_id, payload, label, attempts "
+                "FROM requests ORDER BY created_at"
+            ).fetchall()
+
+    async def drain(self, timeout: float) -> int:
+        """Wait up to `timeout` for in-flight requests; cancel and return the leftovers.
+
+        Work handed to `run()` afterwards is deferred without being started.
+        """
+
+        if self._in_flight:
+            logger.info("Draining %d in-flight requests (up to %.0fs)", len(self._in_flight), timeout)
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._closing = True
+        leftovers = [task for task in self._in_flight.values() if task is not None and not task.done()]
+        for task in leftovers:
+            task.cancel()
+        if leftovers:
+            logger.warning(
+                "Cancelled %d requests after the grace period; they will be replayed",
+                len(leftovers),
+            )
+            await asyncio.gather(*leftovers, return_exceptions=True)
+        return len(leftovers)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self._flush()
+        if self._conn is not None:
+            await asyncio.to_thread(self._close_connection)
+            self._conn = None
+
+    def _close_connection(self) -> None:
+        assert self._conn is not None
+        # Cancelling the flusher does not stop a batch already in a worker thread;
+        # the lock makes us wait for its commit instead of closing mid-transaction.
+        with self._write_lock:
+            self._conn.close()
+
+    def _track(self, entry_id: str) -> None:
+        self._in_flight[entry_id] = None
+        self._idle.clear()
+
+    def _release(self, entry_id: str, *, completed: bool) -> None:
+        self._in_flight.pop(entry_id, None)
+        if not self._in_flight:
+            self._idle.set()
+        if not completed or self._conn is None:
+            return
+        if self._pending_inserts.pop(entry_id, None) is None:
+            self._pending_deletes.append(entry_id)
+            self._wake.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            # Let a batch accumulate; fast requests finish before they are written.
+            await asyncio.sleep(self._flush_interval)
+            self._wake.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if self._conn is None or not (self._pending_inserts or self._pending_deletes):
+            return
+        inserts = list(self._pending_inserts.values())
+        deletes = [(entry_id,) for entry_id in self._pending_deletes]
+        self._pending_inserts.clear()
+        self._pending_deletes.clear()
+        try:
+            await asyncio.to_thread(self._write, inserts, deletes)
+        except sqlite3.Error:
+            logger.exception("Request journal write failed (%d rows)", len(inserts) + len(deletes))
+
+    def _write(self, inserts: list[tuple], deletes: list[tuple]) -> None:
+        assert self._conn is not None
+        with self._write_lock, self._conn:
+            self._conn.execute("BEGIN")
+            if inserts:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO requests "
+                    "(id, kind, chat_id, message_id, payload, label, state, attempts, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    inserts,
+                )
+            if deletes:
+                self._conn.executemany("DELETE FROM requests WHERE id = ?", deletes)
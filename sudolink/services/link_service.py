@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
+from typing import Iterator
+
+from sudolink.core.bundle_cache import BundleCache, context_key, url_key
+from sudolink.core.circuit_breaker import CircuitOpenError, FailureCache
 from sudolink.core.meta_fetcher import MetaFetcher
 from sudolink.core.result_curator import ResultCurator
+from sudolink.exceptions import MetadataFetchError, SearchProviderError
+from sudolink.metrics import CACHE_LOOKUPS_TOTAL, track_stage
 from sudolink.services.ai_expansion import AIExpansionService
+from sudolink.tracing import current_trace
 from sudolink.types import LinkBundle, MetaInfo
 
 
@@ -15,16 +23,45 @@ class LinkService:
         meta_fetcher: MetaFetcher,
         ai_service: AIExpansionService,
         result_curator: ResultCurator,
+        cache: BundleCache | None = None,
+        failures: FailureCache | None = None,
     ) -> None:
         self._meta_fetcher = meta_fetcher
         self._ai_service = ai_service
         self._curator = result_curator
+        self._cache = cache
+        self._failures = failures
+
+    @property
+    def cache(self) -> BundleCache | None:
+        return self._cache
+
+    def breaker_status(self) -> dict[str, str]:
+        """States of the OpenAI breaker and of any publisher breaker that is not closed."""
+
+        return {
+            self._ai_service.breaker.name: self._ai_service.breaker.state,
+            **self._meta_fetcher.breakers.unhealthy(),
+        }
+
+    def cached_bundle(self, url: str, *, limit: int) -> LinkBundle | None:
+        """The bundle `generate_bundle(url, limit=limit)` would return, if already cached."""
+
+        return self._cached(url_key(url, limit))
 
     async def generate_bundle(self, url: str, *, limit: int) -> LinkBundle:
-        original = await self._fetch_meta(url)
-        suggestions, insights = await self._ai_service.expand(original, limit=limit)
-        curated = self._curator.curate(suggestions, limit)
-        return LinkBundle(original=original, related=curated, insights=tuple(insights))
+        key = url_key(url, limit)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        self._raise_recent_failure(key)
+        with track_stage("pipeline"), self._remember_failure(key):
+            original = await self._fetch_meta(url)
+            suggestions, insights = await self._ai_service.expand(original, limit=limit)
+            curated = self._curator.curate(suggestions, limit)
+        bundle = LinkBundle(original=original, related=curated, insights=tuple(insights))
+        self._store(key, bundle)
+        return bundle
 
     async def generate_from_context(
         self,
@@ -33,6 +70,11 @@ class LinkService:
         limit: int,
         reference_label: str | None = None,
     ) -> LinkBundle:
+        key = context_key(context_text, limit, reference_label)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        self._raise_recent_failure(key)
         snippet = context_text.strip()
         title = reference_label or (snippet[:80] if snippet else "Conversation snippet")
         meta = MetaInfo(
@@ -41,9 +83,60 @@ class LinkService:
             description=snippet or None,
             keywords=(),
         )
-        suggestions, insights = await self._ai_service.expand(meta, limit=limit)
-        curated = self._curator.curate(suggestions, limit)
-        return LinkBundle(original=meta, related=curated, insights=tuple(insights))
+        with track_stage("pipeline"), self._remember_failure(key):
+            suggestions, insights = await self._ai_service.expand(meta, limit=limit)
+            curated = self._curator.curate(suggestions, limit)
+        bundle = LinkBundle(original=meta, related=curated, insights=tuple(insights))
+        self._store(key, bundle)
+        return bundle
+
+    def _cached(self, key: str) -> LinkBundle | None:
+        if self._cache is None:
+            return None
+        bundle = self._cache.get(key)
+        CACHE_LOOKUPS_TOTAL.labels("hit" if bundle is not None else "miss").inc()
+        if bundle is not None:
+            _annotate_trace(bundle, cached=True)
+        return bundle
+
+    def _raise_recent_failure(self, key: str) -> None:
+        if self._failures is None:
+            return
+        error = self._failures.get(key)
+        if error is not None:
+            CACHE_LOOKUPS_TOTAL.labels("negative_hit").inc()
+            # A fresh instance per raise so tracebacks do not accumulate on the cached one.
+            raise type(error)(*error.args)
+
+    @contextmanager
+    def _remember_failure(self, key: str) -> Iterator[None]:
+        try:
+            yield
+        except (MetadataFetchError, SearchProviderError) as exc:
+            # Breaker rejections are already instant and carry a countdown; caching
+            # them would replay a stale "retry in N s" and outlive the breaker.
+            if self._failures is not None and not isinstance(exc.__cause__, CircuitOpenError):
+                # Keep only type and message; the live exception pins its frames.
+                self._failures.put(key, type(exc)(*exc.args))
+            raise
+
+    def _store(self, key: str, bundle: LinkBundle) -> None:
+        _annotate_trace(bundle, cached=False)
+        if self._cache is not None:
+            self._cache.put(key, bundle)
 
     async def _fetch_meta(self, url: str) -> MetaInfo:
         return await self._meta_fetcher.fetch(url)
+
+
+def _annotate_trace(bundle: LinkBundle, *, cached: bool) -> None:
+    trace = current_trace()
+    if trace is None:
+        return
+    # Hostnames only: full URLs stay out of the logs.
+    trace.fields.update(
+        host=bundle.original.host or None,
+        results=len(bundle.related),
+        insights=len(bundle.insights),
+        cached=cached,
+    )
@@ -0,0 +1,92 @@
+"""Debounced background expansion that warms the bundle cache for inline queries.
+
+Inline queries arrive on every keystroke, so `schedule()` only remembers the
+latest URL per user and starts the pipeline once that user has stopped typing
+for `debounce` seconds. Expansions are deduplicated by cache key and capped at
+`max_running`; the caller never awaits them. A later query for the same URL
+then finds the finished bundle in the cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sudolink.core.bundle_cache import url_key
+from sudolink.exceptions import SudoLinkError
+from sudolink.metrics import REQUESTS_TOTAL
+from sudolink.services.link_service import LinkService
+from sudolink.tracing import log_trace, start_trace
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        service: LinkService,
+        *,
+        debounce: float = 0.8,
+        max_running: int = 8,
+    ) -> None:
+        self._service = service
+        self._debounce = debounce
+        self._max_running = max(1, max_running)
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+        self._running: dict[str, asyncio.Task[None]] = {}
+        self._closed = False
+
+    def schedule(self, user_id: int, url: str, *, limit: int) -> None:
+        """Expand `url` once `user_id` has been idle for the debounce interval."""
+
+        if self._closed:
+            return
+        previous = self._timers.pop(user_id, None)
+        if previous is not None:
+            previous.cancel()
+        loop = asyncio.get_running_loop()
+        self._timers[user_id] = loop.call_later(self._debounce, self._start, user_id, url, limit)
+
+    async def close(self) -> None:
+        """Cancel pending and running expansions; later `schedule()` calls do nothing.
+
+        Must run before the HTTP client closes and before the cache is dumped.
+        """
+
+        self._closed = True
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, user_id: int, url: str, limit: int) -> None:
+        self._timers.pop(user_id, None)
+        key = url_key(url, limit)
+        if key in self._running:
+            return
+        if len(self._running) >= self._max_running:
+            REQUESTS_TOTAL.labels("prefetch", "dropped").inc()
+            return
+        task = asyncio.create_task(self._expand(url, limit), name=f"prefetch-{key}")
+        self._running[key] = task
+        task.add_done_callback(lambda _task: self._running.pop(key, None))
+
+    async def _expand(self, url: str, limit: int) -> None:
+        outcome = "error"
+        with start_trace("prefetch") as trace:
+            try:
+                await self._service.generate_bundle(url, limit=limit)
+                outcome = "ok"
+            except SudoLinkError as exc:
+                logger.info("Inline prefetch failed: %s", exc)
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            except Exception:
+                logger.exception("Unexpected inline prefetch error")
+            finally:
+                REQUESTS_TOTAL.labels("prefetch", outcome).inc()
+                log_trace(trace, outcome)
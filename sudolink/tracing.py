@@ -0,0 +1,101 @@
+"""Per-request trace ids and structured JSON logging.
+
+A `RequestTrace` is bound to a context variable for the lifetime of one
+handler call, so everything awaited underneath it (`LinkService`,
+`MetaFetcher`, `AIExpansionService`) sees the same trace id without threading
+it through signatures. Stage timings recorded via `sudolink.metrics.track_stage`
+are attached to the active trace and emitted as one log record when it ends.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[RequestTrace | None] = ContextVar("sudolink_trace", default=None)
+
+
+class RequestTrace:
+    __slots__ = ("trace_id", "command", "fields", "stages", "_started")
+
+    def __init__(self, command: str, **fields: Any) -> None:
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.command = command
+        self.fields = fields
+        self.stages: list[tuple[str, float]] = []
+        self._started = time.perf_counter()
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        self.stages.append((stage, seconds))
+
+    def summary(self, outcome: str) -> dict[str, Any]:
+        timings: dict[str, float] = {}
+        for stage, seconds in self.stages:
+            timings[stage] = round(timings.get(stage, 0.0) + seconds * 1000, 2)
+        return {
+            "command": self.command,
+            "outcome": outcome,
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "stages_ms": timings,
+            **self.fields,
+        }
+
+
+def current_trace() -> RequestTrace | None:
+    return _current.get()
+
+
+def current_trace_id() -> str | None:
+    trace = _current.get()
+    return trace.trace_id if trace is not None else None
+
+
+@contextmanager
+def start_trace(command: str, **fields: Any) -> Iterator[RequestTrace]:
+    """Bind a new trace to the current context; the caller logs `summary()`."""
+
+    trace = RequestTrace(command, **fields)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def log_trace(trace: RequestTrace, outcome: str) -> None:
+    summary = trace.summary(outcome)
+    logger.info(
+        "request %s %s in %.0f ms",
+        trace.command,
+        outcome,
+        summary["total_ms"],
+        extra={"trace": summary},
+    )
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; includes `trace_id` and trace summaries."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        trace_id = current_trace_id()
+        if trace_id:
+            payload["trace_id"] = trace_id
+        summary = getattr(record, "trace", None)
+        if summary:
+            payload.update(summary)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
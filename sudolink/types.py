@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Sequence
 from urllib.parse import urlparse
 
 
@@ -19,6 +19,23 @@ class MetaInfo:
     def host(self) -> str:
         return urlparse(self.url).netloc
 
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "title": self.title,
+            "description": self.description,
+            "keywords": list(self.keywords),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MetaInfo:
+        return cls(
+            url=str(data["url"]),
+            title=data.get("title"),
+            description=data.get("description"),
+            keywords=tuple(data.get("keywords") or ()),
+        )
+
 
 @dataclass(slots=True)
 class SearchResult:
@@ -34,6 +51,26 @@ class SearchResult:
         path = parsed.path.rstrip("/")
         return f"{parsed.netloc.lower()}|{path.lower()}|{self.title.strip().lower()}"
 
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "description": self.description,
+            "source": self.source,
+            "published_at": self.published_at.isoformat() if self.published_at else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SearchResult:
+        published = data.get("published_at")
+        return cls(
+            title=str(data["title"]),
+            url=str(data["url"]),
+            description=data.get("description"),
+            source=data.get("source"),
+            published_at=datetime.fromisoformat(published) if published else None,
+        )
+
 
 @dataclass(slots=True)
 class LinkBundle:
@@ -43,3 +80,18 @@ class LinkBundle:
 
     def as_iterable(self) -> Iterable[SearchResult]:
         return tuple(self.related)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "original": self.original.as_dict(),
+            "related": [item.as_dict() for item in self.related],
+            "insights": list(self.insights),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LinkBundle:
+        return cls(
+            original=MetaInfo.from_dict(data["original"]),
+            related=tuple(SearchResult.from_dict(item) for item in data.get("related") or ()),
+            insights=tuple(data.get("insights") or ()),
+        )